@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Bulk resume screening
+Runs the rule-based ATS analysis over many resume texts across a process
+pool and streams one row per resume to JSONL or CSV.
+
+Input is either the JSONL written by extract_resumes.py (records with
+"path" and "text") or a directory of .txt files.
+
+Usage:
+    python analyze_resumes.py extracted.jsonl --role "Backend Developer" -o scores.csv
+    python analyze_resumes.py texts/ --skills "Python,SQL,Docker" -o scores.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+
+CSV_FIELDS = [
+    'path', 'document_type', 'ats_score', 'keyword_match_score', 'section_score', 'format_score',
+    'contact_score', 'summary_score', 'skills_score', 'experience_score', 'education_score',
+    'missing_skills', 'best_fit_role', 'error'
+]
+
+
+def iter_texts(source):
+    """Yield ``(path, text)`` from an extraction JSONL file or a directory of .txt files"""
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith('.txt'):
+                    path = os.path.join(root, name)
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        yield path, f.read()
+        return
+
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('text'):
+                yield record.get('path', ''), record['text']
+
+
+def find_role(role_name, category=None):
+    """Requirements of a JOB_ROLES role, looked up by name"""
+    from config.job_roles import JOB_ROLES
+
+    for role_category, roles in JOB_ROLES.items():
+        if category and role_category != category:
+            continue
+        if role_name in roles:
+            return roles[role_name]
+    return None
+
+
+def to_row(path, analysis):
+    """Flatten an analyze_resume result into one output row"""
+    section_scores = analysis.get('section_scores', {})
+    best_fit = analysis.get('best_fit_roles') or [{}]
+    return {
+        'path': path,
+        'document_type': analysis.get('document_type'),
+        'ats_score': analysis.get('ats_score'),
+        'keyword_match_score': analysis.get('keyword_match', {}).get('score'),
+        'section_score': analysis.get('section_score'),
+        'format_score': analysis.get('format_score'),
+        'contact_score': section_scores.get('contact'),
+        'summary_score': section_scores.get('summary'),
+        'skills_score': section_scores.get('skills'),
+        'experience_score': section_scores.get('experience'),
+        'education_score': section_scores.get('education'),
+        'missing_skills': analysis.get('keyword_match', {}).get('missing_skills', []),
+        'best_fit_role': best_fit[0].get('role'),
+        'error': analysis.get('error')
+    }
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(dict(row, missing_skills=';'.join(row['missing_skills'])))
+
+    def close(self):
+        self.file.close()
+
+
+def run(source, writer, job_requirements, workers=None, batch_size=16):
+    """Analyze every text from ``source`` and write rows as results arrive"""
+    from utils.resume_analyzer import ResumeAnalyzer
+
+    paths = deque()
+
+    def texts():
+        for path, text in iter_texts(source):
+            paths.append(path)
+            yield text
+
+    stats = {'docs': 0, 'resumes': 0, 'errors': 0, 'ats_total': 0}
+    start = time.perf_counter()
+    for analysis in ResumeAnalyzer().analyze_many(texts(), job_requirements, workers, batch_size):
+        row = to_row(paths.popleft(), analysis)
+        writer.write(row)
+        stats['docs'] += 1
+        if row['error']:
+            stats['errors'] += 1
+        elif row['document_type'] == 'resume':
+            stats['resumes'] += 1
+            stats['ats_total'] += row['ats_score']
+        if stats['docs'] % 500 == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{stats['docs']} analyzed, {stats['docs'] / elapsed:.0f} docs/s")
+    stats['elapsed'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    """Parse arguments and run the batch"""
+    parser = argparse.ArgumentParser(description="Score many resumes against one job role")
+    parser.add_argument('source', help="JSONL from extract_resumes.py or a directory of .txt files")
+    parser.add_argument('-o', '--output', required=True, help="Output .jsonl or .csv file")
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help="Output format (default: from the output extension)")
+    parser.add_argument('--role', help="Role name from JOB_ROLES, e.g. \"Data Scientist\"")
+    parser.add_argument('--category', help="JOB_ROLES category, if the role name is ambiguous")
+    parser.add_argument('--skills', help="Comma-separated required skills instead of a role")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--batch-size', type=int, default=16, help="Resumes sent to a worker at a time")
+    args = parser.parse_args()
+
+    if args.skills:
+        job_requirements = {'required_skills': [skill.strip() for skill in args.skills.split(',') if skill.strip()]}
+    elif args.role:
+        job_requirements = find_role(args.role, args.category)
+        if job_requirements is None:
+            print(f"Unknown role: {args.role}")
+            sys.exit(1)
+    else:
+        parser.error("either --role or --skills is required")
+
+    output_format = args.format or ('csv' if args.output.endswith('.csv') else 'jsonl')
+    writer = CsvWriter(args.output) if output_format == 'csv' else JsonlWriter(args.output)
+    try:
+        stats = run(args.source, writer, job_requirements, args.workers, args.batch_size)
+    finally:
+        writer.close()
+
+    rate = stats['docs'] / stats['elapsed'] if stats['elapsed'] else 0
+    average = stats['ats_total'] / stats['resumes'] if stats['resumes'] else 0
+    print(f"\nAnalyzed {stats['docs']} documents ({stats['resumes']} resumes, {stats['errors']} errors, "
+          f"average ATS {average:.1f}) in {stats['elapsed']:.1f}s - {rate:.1f} docs/s with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
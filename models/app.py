@@ -30,6 +30,10 @@ from config.database import (
 from utils.ai_resume_analyzer import AIResumeAnalyzer
 from utils.resume_builder import ResumeBuilder
 from utils.resume_analyzer import ResumeAnalyzer
+from utils.analysis_cache import get_analysis_cache
+from utils.text_extractor import ExtractionPipeline
+from utils.extraction_worker import ExtractionBudget
+from utils.stage_profiler import profiler_from_env
 import traceback
 import plotly.express as px
 import pandas as pd
@@ -87,7 +91,12 @@ class ResumeApp:
         # Initialize dashboard manager
         
 
-        self.analyzer = ResumeAnalyzer()
+        # Per-section results live in the session, so re-analyzing after an edit on a
+        # later rerun only recomputes the sections that changed
+        self.analyzer = ResumeAnalyzer(
+            analysis_cache=get_analysis_cache(), profiler=profiler_from_env(),
+            section_results=st.session_state.setdefault('analysis_section_results', {})
+        )
         self.ai_analyzer = AIResumeAnalyzer()
         self.builder = ResumeBuilder()
         self.job_roles = JOB_ROLES
@@ -539,6 +548,43 @@ class ResumeApp:
         st.session_state.analytics_data = analytics
         return analytics
 
+    def get_extraction_pipeline(self, uploaded_file):
+        """Return the extraction pipeline that owns this upload across reruns"""
+        pipelines = st.session_state.setdefault('extraction_pipelines', {})
+        pipeline = ExtractionPipeline(uploaded_file, budget=ExtractionBudget.from_env())
+        if pipeline.file_hash in pipelines:
+            return pipelines[pipeline.file_hash]
+        # Only keep pipelines for the last few uploads
+        while len(pipelines) >= 4:
+            pipelines.pop(next(iter(pipelines)))
+        pipelines[pipeline.file_hash] = pipeline
+        return pipeline
+
+    def extract_with_progress(self, uploaded_file):
+        """Extract an upload page by page, showing progress as pages finish"""
+        pipeline = self.get_extraction_pipeline(uploaded_file)
+        progress_bar = st.progress(0.0, text="Extracting text from your resume...")
+
+        def show_progress(done, total):
+            if total:
+                progress_bar.progress(min(done / total, 1.0),
+                                      text=f"Extracted page {done} of {total}")
+
+        for page_number, page_text, backend in pipeline.iter_pages(progress=show_progress):
+            pass
+        progress_bar.empty()
+
+        # Budget-limited extractions still return what they got; say so
+        status_messages = {
+            'truncated': "Your resume is unusually long, so only the first pages were analyzed.",
+            'partial': "Extraction ran out of time, so only part of your resume was analyzed.",
+            'fallback': "Full extraction failed, so a basic text-only reader was used. Results may be incomplete.",
+            'timeout': "Extraction timed out. The file may be damaged or too large."
+        }
+        if pipeline.result.status in status_messages:
+            st.warning(status_messages[pipeline.result.status])
+        return pipeline.result
+
     def handle_resume_upload(self):
         """Handle resume upload and analysis"""
         uploaded_file = st.file_uploader(
@@ -547,10 +593,7 @@ class ResumeApp:
         if uploaded_file is not None:
             try:
                 # Extract text from resume
-                if uploaded_file.type == "application/pdf":
-                    resume_text = extract_text_from_pdf(uploaded_file)
-                else:
-                    resume_text = extract_text_from_docx(uploaded_file)
+                resume_text = self.get_extraction_pipeline(uploaded_file).text
 
                 # Store resume data
                 st.session_state.resume_data = {
@@ -1293,32 +1336,11 @@ class ResumeApp:
                         # Get file content
                         text = ""
                         try:
-                            if uploaded_file.type == "application/pdf":
-                                try:
-                                    text = self.analyzer.extract_text_from_pdf(uploaded_file)
-                                except Exception as pdf_error:
-                                    st.error(f"PDF extraction failed: {str(pdf_error)}")
-                                    st.info("Trying alternative PDF extraction method...")
-                                    # Try AI analyzer as backup
-                                    try:
-                                        text = self.ai_analyzer.extract_text_from_pdf(uploaded_file)
-                                    except Exception as backup_error:
-                                        st.error(f"All PDF extraction methods failed: {str(backup_error)}")
-                                        return
-                            elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                                try:
-                                    text = self.analyzer.extract_text_from_docx(uploaded_file)
-                                except Exception as docx_error:
-                                    st.error(f"DOCX extraction failed: {str(docx_error)}")
-                                    # Try AI analyzer as backup
-                                    try:
-                                        text = self.ai_analyzer.extract_text_from_docx(uploaded_file)
-                                    except Exception as backup_error:
-                                        st.error(f"All DOCX extraction methods failed: {str(backup_error)}")
-                                        return
-                            else:
-                                text = uploaded_file.getvalue().decode()
-                                
+                            extraction = self.extract_with_progress(uploaded_file)
+                            text = extraction.text
+                            for extraction_error in extraction.errors:
+                                st.warning(f"Extraction fallback: {extraction_error}")
+
                             if not text or text.strip() == "":
                                 st.error("Could not extract any text from the uploaded file. Please try a different file.")
                                 return
@@ -1458,6 +1480,18 @@ class ResumeApp:
 
                         st.markdown("</div>", unsafe_allow_html=True)
 
+                        # Best-fit roles, scored against every role in one pass
+                        if analysis.get('best_fit_roles'):
+                            st.markdown("""
+                            <div class="feature-card">
+                                <h2>Best-Fit Roles</h2>
+                            """, unsafe_allow_html=True)
+                            for fit in analysis['best_fit_roles']:
+                                st.markdown(f"- **{fit['role']}** ({fit['category']}): "
+                                            f"{int(fit['fit_score'])}% fit, "
+                                            f"{int(fit['required_score'])}% of required skills")
+                            st.markdown("</div>", unsafe_allow_html=True)
+
                     with col2:
                         # Format Score Card
                         st.markdown("""
@@ -2296,20 +2330,21 @@ class ResumeApp:
                                 type="primary",
                                 use_container_width=True,
                                 key="analyze_ai_button")
+                bypass_ai_cache = st.checkbox(
+                    "Run a fresh AI analysis",
+                    key="ai_bypass_cache",
+                    help="Repeat analyses of the same resume and role are served from a cache; check this to ask the model again")
 
                 if analyze_ai:
                     with st.spinner(f"Analyzing your resume with {ai_model}..."):
                         # Get file content
                         text = ""
                         try:
-                            if uploaded_file.type == "application/pdf":
-                                text = self.analyzer.extract_text_from_pdf(
-                                    uploaded_file)
-                            elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                                text = self.analyzer.extract_text_from_docx(
-                                    uploaded_file)
-                            else:
-                                text = uploaded_file.getvalue().decode()
+                            extraction = self.extract_with_progress(uploaded_file)
+                            text = extraction.text
+                            if not extraction.ok:
+                                st.error("Could not extract any text from the uploaded file. Please try a different file.")
+                                st.stop()
                         except Exception as e:
                             st.error(f"Error reading file: {str(e)}")
                             st.stop()
@@ -2326,19 +2361,10 @@ class ResumeApp:
                                 # Update progress
                                 progress_bar.progress(10)
                                 
-                                # Extract text from the resume
-                                analyzer = AIResumeAnalyzer()
-                                if uploaded_file.type == "application/pdf":
-                                    resume_text = analyzer.extract_text_from_pdf(
-                                        uploaded_file)
-                                elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                                    resume_text = analyzer.extract_text_from_docx(
-                                        uploaded_file)
-                                else:
-                                    # For text files or other formats
-                                    resume_text = uploaded_file.getvalue().decode('utf-8')
+                                # Reuse the text extracted above instead of parsing the file again
+                                analyzer = self.ai_analyzer
+                                resume_text = text
                                 
-                                # Initialize the AI analyzer (moved after text extraction)
                                 progress_bar.progress(30)
                                 
                                 # Get the job role
@@ -2351,13 +2377,14 @@ class ResumeApp:
                                 if use_custom_job_desc and custom_job_description:
                                     # Use custom job description for analysis
                                     analysis_result = analyzer.analyze_resume_with_gemini(
-                                        resume_text, job_role=job_role, job_description=custom_job_description)
+                                        resume_text, job_role=job_role, job_description=custom_job_description,
+                                        bypass_cache=bypass_ai_cache)
                                     # Show that custom job description was used
                                     st.session_state['used_custom_job_desc'] = True
                                 else:
                                     # Use standard role-based analysis
                                     analysis_result = analyzer.analyze_resume_with_gemini(
-                                        resume_text, job_role=job_role)
+                                        resume_text, job_role=job_role, bypass_cache=bypass_ai_cache)
                                     st.session_state['used_custom_job_desc'] = False
 
                                 
@@ -2388,6 +2415,8 @@ class ResumeApp:
                                 # Display the analysis result
                                 if analysis_result and "error" not in analysis_result:
                                     st.success("✅ Analysis complete!")
+                                    if analysis_result.get("cached"):
+                                        st.caption("Served from the AI analysis cache - check \"Run a fresh AI analysis\" to ask the model again.")
                                     
                                     # Extract data from the analysis
                                     full_response = analysis_result.get(
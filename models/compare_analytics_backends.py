@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Resume analytics backend comparison
+Runs the spaCy and the lite (spaCy-free) analytics backends over the same
+resume texts, reports every field where their results differ, and
+benchmarks load time, memory and throughput of each.
+
+Input is the JSONL written by extract_resumes.py, a directory of .txt
+files, or the stored resumes in the database (--db). The lite backend is
+loaded first, so its memory figure does not include spaCy. Exits with
+status 1 when any result differs.
+
+Usage:
+    python compare_analytics_backends.py extracted.jsonl
+    python compare_analytics_backends.py --db --limit 2000 --show 5
+"""
+
+import argparse
+import itertools
+import sys
+import time
+
+from analyze_resumes import iter_texts
+
+# Result fields compared; "timestamp" differs between any two runs
+COMPARED_FIELDS = ['word_count', 'sentence_count', 'skills_count', 'experience_years', 'profile_score',
+                   'skills', 'suggestions']
+
+
+def load_texts(source, use_db, limit):
+    """Resume texts from ``source`` or the database, at most ``limit`` of them"""
+    if use_db:
+        from config.database import iter_resume_texts
+        texts = (text for _, text in iter_resume_texts())
+    else:
+        texts = (text for _, text in iter_texts(source))
+    return list(itertools.islice(texts, limit))
+
+
+def benchmark(backend, texts, model):
+    """Analyze ``texts`` with ``backend``; returns its results and timings"""
+    from resume_analytics.backends import create_analyzer
+    from resume_analytics.nlp_registry import rss_bytes
+
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    analyzer = create_analyzer(backend, model)
+    # The first document pays for loading the model and compiling matchers
+    analyzer.analyze_resume("Warm-up sentence with 3 years of Python. Another sentence.")
+    load_seconds = time.perf_counter() - start
+    rss_after = rss_bytes()
+
+    start = time.perf_counter()
+    results = list(analyzer.analyze_batch(texts))
+    elapsed = time.perf_counter() - start
+    return results, {
+        'load_seconds': load_seconds,
+        'rss_added_bytes': rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+        'elapsed': elapsed,
+        'docs_per_second': len(texts) / elapsed if elapsed else 0
+    }
+
+
+def field_values(result):
+    """Comparable values of one analytics result, keyed by field"""
+    values = dict(result['metrics'])
+    values['skills'] = sorted(result['skills'])
+    values['suggestions'] = [suggestion['text'] for suggestion in result['suggestions']]
+    return values
+
+
+def compare(spacy_results, lite_results, texts, show=0):
+    """Count differing fields; print the first ``show`` differing documents"""
+    mismatches = {field: 0 for field in COMPARED_FIELDS}
+    key_mismatches = 0
+    shown = 0
+    for index, (expected, actual) in enumerate(zip(spacy_results, lite_results)):
+        if expected.keys() != actual.keys() or expected['metrics'].keys() != actual['metrics'].keys():
+            key_mismatches += 1
+        expected_values, actual_values = field_values(expected), field_values(actual)
+        differing = [field for field in COMPARED_FIELDS if expected_values.get(field) != actual_values.get(field)]
+        for field in differing:
+            mismatches[field] += 1
+        if differing and shown < show:
+            shown += 1
+            print(f"\nDocument {index}: {texts[index][:80]!r}")
+            for field in differing:
+                print(f"  {field}: spacy={expected_values.get(field)!r} lite={actual_values.get(field)!r}")
+    return mismatches, key_mismatches
+
+
+def main():
+    """Parse arguments, run both backends and print the report"""
+    parser = argparse.ArgumentParser(description="Compare the spaCy and lite resume analytics backends")
+    parser.add_argument('source', nargs='?', help="JSONL from extract_resumes.py or a directory of .txt files")
+    parser.add_argument('--db', action='store_true', help="Read the stored resumes from the database instead")
+    parser.add_argument('--limit', type=int, default=None, help="Compare at most this many resumes")
+    parser.add_argument('--model', default=None, help="spaCy model for the spacy backend")
+    parser.add_argument('--show', type=int, default=3, help="Differing documents to print")
+    args = parser.parse_args()
+    if not args.source and not args.db:
+        parser.error("either a source or --db is required")
+
+    from resume_analytics.nlp_registry import DEFAULT_MODEL
+
+    texts = load_texts(args.source, args.db, args.limit)
+    if not texts:
+        print("No resume texts found")
+        sys.exit(1)
+
+    model = args.model or DEFAULT_MODEL
+    lite_results, lite_stats = benchmark('lite', texts, model)
+    spacy_results, spacy_stats = benchmark('spacy', texts, model)
+    mismatches, key_mismatches = compare(spacy_results, lite_results, texts, args.show)
+
+    print(f"\nParity over {len(texts)} documents")
+    print(f"  output keys differ: {key_mismatches}")
+    for field, count in mismatches.items():
+        print(f"  {field}: {count} differ ({100 * (1 - count / len(texts)):.2f}% identical)")
+
+    print("\nBenchmark")
+    for backend, stats in (('spacy', spacy_stats), ('lite', lite_stats)):
+        memory = f"{stats['rss_added_bytes'] / 2 ** 20:.1f} MB" if stats['rss_added_bytes'] is not None else "n/a"
+        print(f"  {backend:5}  load {stats['load_seconds']:.2f}s, memory +{memory}, "
+              f"{stats['docs_per_second']:.0f} docs/s ({stats['elapsed'] * 1e6 / len(texts):.0f} us/doc)")
+
+    if key_mismatches or any(mismatches.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -256,6 +256,31 @@ def get_all_resume_data():
     finally:
         conn.close()
 
+def iter_resume_texts(batch_size=500):
+    """Yield (resume id, text) for every stored resume, for backfilling analytics.
+
+    The text is the summary, education, experience, projects and skills
+    columns joined; rows are fetched ``batch_size`` at a time.
+    """
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+        SELECT id, summary, education, experience, projects, skills
+        FROM resume_data
+        ORDER BY id
+        ''')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                # List columns are stored as str(list), so an empty one reads '[]'
+                yield row[0], '\n'.join(field for field in row[1:] if field and field != '[]')
+    finally:
+        conn.close()
+
 def verify_admin(email, password):
     """Verify admin credentials"""
     conn = get_database_connection()
@@ -0,0 +1,68 @@
+# Alternative spellings, abbreviations and aliases of skills, keyed by canonical name.
+# Skills named in JOB_ROLES that are not listed here are canonical under their own name;
+# slash composites such as "React/Angular/Vue" are split when every part is a known skill.
+# Avoid aliases that are also ordinary words or abbreviations ("Go", "Express", "RN",
+# "Node", "REST").
+SKILL_SYNONYMS = {
+    # Languages
+    "JavaScript": ["ECMAScript", "ES6", "Java Script", "Vanilla JS"],
+    "TypeScript": ["Type Script"],
+    "Python": ["Python3", "Python 3"],
+    "C++": ["CPP", "C plus plus"],
+    "C#": ["C Sharp", "CSharp"],
+    "Kotlin": [],
+    "Swift": [],
+    "HTML": ["HTML5"],
+    "CSS": ["CSS3"],
+    "SQL": ["Structured Query Language"],
+
+    # Frameworks and libraries
+    "React": ["ReactJS", "React.js"],
+    "React Native": [],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Node.js": ["NodeJS"],
+    "Express.js": ["ExpressJS"],
+    "Django": [],
+    "Flask": [],
+    "Spring": ["Spring Boot", "SpringBoot"],
+    "TensorFlow": [],
+    "PyTorch": [],
+
+    # Data and databases
+    "PostgreSQL": ["Postgres", "PSQL"],
+    "MySQL": [],
+    "MongoDB": [],
+    "Power BI": ["PowerBI"],
+    "Tableau": [],
+    "Excel": ["MS Excel", "Microsoft Excel"],
+    "Machine Learning": ["ML"],
+    "Deep Learning": [],
+    "Artificial Intelligence": ["AI"],
+    "Natural Language Processing": ["NLP"],
+    "Data Science": [],
+
+    # Cloud and infrastructure
+    "AWS": ["Amazon Web Services"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Azure": ["Microsoft Azure", "MS Azure"],
+    "Kubernetes": ["K8s"],
+    "Docker": [],
+    "CI/CD": ["CICD", "Continuous Integration", "Continuous Delivery", "Continuous Deployment"],
+    "Infrastructure as Code": ["IaC"],
+    "Git": ["GitHub", "GitLab"],
+    "Jenkins": [],
+    "Jira": [],
+
+    # Mobile
+    "iOS Development": ["iOS"],
+    "Android Development": ["Android"],
+
+    # Practices and soft skills
+    "APIs": ["API"],
+    "RESTful APIs": ["REST API", "REST APIs", "RESTful"],
+    "UI/UX": ["UX/UI", "UI UX"],
+    "Problem-solving": ["Problem Solving", "Problem solver"],
+    "Agile": ["Agile Methodologies"],
+    "Database Design": [],
+}
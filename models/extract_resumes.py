@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Bulk resume text extraction
+Extracts every PDF/DOCX in a directory (or listed in a manifest) across a
+process pool and streams one record per file to JSONL or Parquet.
+
+Usage:
+    python extract_resumes.py resumes/ -o extracted.jsonl --workers 8
+    python extract_resumes.py manifest.txt -o extracted.parquet --backend parser
+
+Paths extracted with status "ok" are appended to ``<output>.done`` once
+their records are safely written, so an interrupted run picks up where it
+left off when started again. Failed and empty files are not marked done and
+are tried again on the next run, which appends a newer record for them.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+# Every record has these keys, failed ones included; "errors" is a JSON list in Parquet output
+RECORD_FIELDS = [
+    ('path', 'string'), ('status', 'string'), ('backend', 'string'), ('planned_backend', 'string'),
+    ('page_count', 'int64'), ('chars', 'int64'), ('file_hash', 'string'), ('errors', 'string'),
+    ('elapsed', 'float64'), ('text', 'string')
+]
+
+
+def find_resumes(source):
+    """List resume paths from a directory tree or a manifest file"""
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+
+    # Manifest: one path per line, or JSONL records with a "path" field
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = json.loads(line)['path'] if line.startswith('{') else line
+            paths.append(path if os.path.isabs(path) else os.path.join(base_dir, path))
+    return paths
+
+
+def load_done_set(done_path):
+    """Paths already extracted by a previous run"""
+    if not os.path.exists(done_path):
+        return set()
+    with open(done_path, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def _init_worker():
+    # Each worker is already one of many processes; don't fan OCR out again
+    from utils import ocr
+    ocr.OCR_WORKERS = 1
+
+
+def extract_one(task):
+    """Extract a single file; runs inside a pool worker"""
+    path, backend, include_text = task
+    start = time.perf_counter()
+    record = {'path': path, 'status': 'failed', 'backend': None, 'planned_backend': None,
+              'page_count': None, 'chars': 0, 'file_hash': None, 'errors': [], 'elapsed': None, 'text': None}
+    try:
+        if backend == 'parser':
+            from utils.resume_parser import ResumeParser
+            from utils.extraction_cache import hash_bytes
+
+            with open(path, 'rb') as f:
+                record['file_hash'] = hash_bytes(f.read())
+                f.seek(0)
+                text = ResumeParser().extract_text(f)
+            record['backend'] = 'pypdf2' if path.lower().endswith('.pdf') else 'docx-xml'
+        else:
+            from utils.text_extractor import ExtractionPipeline
+
+            with open(path, 'rb') as f:
+                pipeline = ExtractionPipeline(f, use_cache=False)
+            result = pipeline.result
+            text = result.text
+            record.update({
+                'file_hash': result.file_hash,
+                'backend': result.backend,
+                'page_count': result.page_count,
+                'errors': result.errors,
+                'planned_backend': (result.probe or {}).get('backend')
+            })
+        record['status'] = 'ok' if text.strip() else 'empty'
+        record['chars'] = len(text)
+        if include_text:
+            record['text'] = text
+    except Exception as e:
+        record['errors'].append(str(e))
+    record['elapsed'] = round(time.perf_counter() - start, 4)
+    return record
+
+
+class JsonlWriter:
+    """Appends one line per record; ``write`` and ``close`` return the records now on disk"""
+
+    def __init__(self, path):
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        return [record]
+
+    def close(self):
+        self.file.close()
+        return []
+
+
+class ParquetWriter:
+    """Writes each batch as a complete part file in the output directory.
+
+    A Parquet file is only readable once closed, so batches are not appended
+    to one open file: each is written to a temporary name and renamed into
+    place, and ``write``/``close`` return the records of a batch only after that.
+    """
+
+    def __init__(self, path, batch_size=256):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            print("Parquet output requires pyarrow: pip install pyarrow")
+            sys.exit(1)
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.run_id = datetime.now().strftime('%Y%m%d%H%M%S')
+        self.schema = pyarrow.schema([(name, getattr(pyarrow, kind)()) for name, kind in RECORD_FIELDS])
+        self.batch_size = batch_size
+        self.batch = []
+        self.parts = 0
+
+    def write(self, record):
+        record = dict(record, errors=json.dumps(record.get('errors', [])))
+        self.batch.append({name: record.get(name) for name, _ in RECORD_FIELDS})
+        if len(self.batch) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self):
+        """Write the pending batch as one part file; returns its records"""
+        if not self.batch:
+            return []
+        table = self.pa.Table.from_pylist(self.batch, schema=self.schema)
+        name = f"part-{self.run_id}-{self.parts:05d}.parquet"
+        # Dataset readers skip dot-files, so a half-written part is never read
+        temp_path = os.path.join(self.path, '.' + name + '.tmp')
+        self.pq.write_table(table, temp_path)
+        os.replace(temp_path, os.path.join(self.path, name))
+        self.parts += 1
+        written = self.batch
+        self.batch = []
+        return written
+
+    def close(self):
+        return self.flush()
+
+
+def mark_done(done_file, records):
+    """Record the paths of written ``records`` that extracted cleanly; others are retried next run"""
+    paths = [record['path'] for record in records if record['status'] == 'ok']
+    if paths:
+        done_file.write(''.join(path + '\n' for path in paths))
+        done_file.flush()
+
+
+def run_batch(paths, writer, done_file, backend='pipeline', workers=None, include_text=True):
+    """Extract ``paths`` across a process pool, writing records as they complete"""
+    workers = workers or os.cpu_count() or 1
+    tasks = iter([(path, backend, include_text) for path in paths])
+    stats = {'files': 0, 'ok': 0, 'failed': 0, 'pages': 0}
+    start = time.perf_counter()
+
+    def handle(record):
+        # Only paths whose records are on disk, and extracted cleanly, go into the done-set
+        mark_done(done_file, writer.write(record))
+        stats['files'] += 1
+        stats['ok' if record['status'] == 'ok' else 'failed'] += 1
+        stats['pages'] += record.get('page_count') or 0
+        print(f"[{stats['files']}/{len(paths)}] {record['status']:6} {record['backend'] or '-':10} "
+              f"{record.get('page_count') or '-':>3}p {record['elapsed']:.2f}s {record['path']}")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(extract_one, task))
+            if len(pending) >= workers * 4:
+                break
+        while pending:
+            record = pending.popleft().result()
+            task = next(tasks, None)
+            if task is not None:
+                pending.append(pool.submit(extract_one, task))
+            handle(record)
+
+    stats['elapsed'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    """Parse arguments and run the batch"""
+    parser = argparse.ArgumentParser(description="Extract text from many resumes at once")
+    parser.add_argument('source', help="Directory of resumes or a manifest file of paths")
+    parser.add_argument('-o', '--output', required=True,
+                        help="Output .jsonl file or .parquet directory")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'],
+                        help="Output format (default: from the output extension)")
+    parser.add_argument('--backend', choices=['pipeline', 'parser'], default='pipeline',
+                        help="pipeline: pdfplumber/PyPDF2/OCR per page; parser: ResumeParser (PyPDF2 only)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--no-text', action='store_true', help="Only write metadata, not the extracted text")
+    parser.add_argument('--restart', action='store_true', help="Ignore the done-set and extract everything again")
+    args = parser.parse_args()
+
+    output_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'jsonl')
+    done_path = args.output.rstrip('/\\') + '.done'
+    if args.restart and os.path.exists(done_path):
+        os.remove(done_path)
+
+    paths = find_resumes(args.source)
+    done = load_done_set(done_path)
+    remaining = [path for path in paths if path not in done]
+    print(f"Found {len(paths)} resumes, {len(paths) - len(remaining)} already done, {len(remaining)} to extract")
+    if not remaining:
+        return
+
+    writer = ParquetWriter(args.output) if output_format == 'parquet' else JsonlWriter(args.output)
+    with open(done_path, 'a', encoding='utf-8') as done_file:
+        try:
+            stats = run_batch(remaining, writer, done_file, args.backend, args.workers, not args.no_text)
+        finally:
+            mark_done(done_file, writer.close())
+
+    rate = stats['files'] / stats['elapsed'] if stats['elapsed'] else 0
+    print(f"\nExtracted {stats['files']} files ({stats['ok']} ok, {stats['failed']} failed, "
+          f"{stats['pages']} pages) in {stats['elapsed']:.1f}s - {rate:.1f} files/s with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,68 @@
-import spacy
+import threading
 from collections import Counter
 from datetime import datetime
 
+from resume_analytics.nlp_registry import DEFAULT_MODEL, get_nlp
+from utils.skill_canon import CANON
+
+_skill_matchers = {}
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher(model=DEFAULT_MODEL):
+    """PhraseMatcher over every skill spelling SkillCanon knows, compiled once per model"""
+    matcher = _skill_matchers.get(model)
+    if matcher is None:
+        with _matcher_lock:
+            matcher = _skill_matchers.get(model)
+            if matcher is None:
+                from spacy.matcher import PhraseMatcher
+                nlp = get_nlp(model)
+                spellings = {}
+                for alias, skill_id in CANON.aliases.items():
+                    spellings.setdefault(skill_id, []).append(alias)
+                matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+                for skill_id, aliases in spellings.items():
+                    matcher.add(skill_id, list(nlp.tokenizer.pipe(aliases)))
+                _skill_matchers[model] = matcher
+    return matcher
+
+
 class ResumeAnalyzer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, model=DEFAULT_MODEL):
+        # The spaCy pipeline is shared per process and loaded on first use
+        self.model = model
+
+    @property
+    def nlp(self):
+        return get_nlp(self.model)
         
     def analyze_resume(self, resume_text):
         """Analyze resume text and return metrics"""
-        doc = self.nlp(resume_text)
+        return self._analyze_doc(resume_text, self.nlp(resume_text))
+    
+    def analyze_batch(self, texts, batch_size=64, n_process=1, as_tuples=False):
+        """Analyze many texts through nlp.pipe, yielding results in input order as they complete.
+        
+        ``n_process`` > 1 (or -1 for every core) runs spaCy in worker processes.
+        With ``as_tuples``, ``texts`` holds (text, context) pairs and
+        (result, context) pairs are yielded, e.g. to backfill stored resumes:
         
+            pairs = ((text, resume_id) for resume_id, text in iter_resume_texts())
+            for result, resume_id in analyzer.analyze_batch(pairs, as_tuples=True, n_process=-1):
+                ...
+        """
+        if as_tuples:
+            for doc, context in self.nlp.pipe(texts, as_tuples=True, batch_size=batch_size, n_process=n_process):
+                yield self._analyze_doc(doc.text, doc), context
+        else:
+            for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+                yield self._analyze_doc(doc.text, doc)
+    
+    def _analyze_doc(self, resume_text, doc):
         # Basic metrics
         word_count = len(resume_text.split())
-        sentence_count = len(list(doc.sents))
+        sentence_count = self._count_sentences(doc)
         
         # Skills extraction
         skills = self._extract_skills(doc)
@@ -40,26 +90,17 @@ class ResumeAnalyzer:
             )
         }
     
+    def _count_sentences(self, doc):
+        """Number of sentences found by the pipeline's sentencizer"""
+        return len(list(doc.sents))
+    
     def _extract_skills(self, doc):
         """Extract skills from resume"""
-        # Common technical skills keywords
-        tech_skills = {
-            "python", "java", "javascript", "react", "node.js", "sql",
-            "html", "css", "aws", "docker", "kubernetes", "git",
-            "machine learning", "ai", "data science", "analytics"
-        }
-        
-        skills = set()
-        for token in doc:
-            if token.text.lower() in tech_skills:
-                skills.add(token.text)
-            # Check for compound skills (e.g., "machine learning")
-            if token.i < len(doc) - 1:
-                bigram = (token.text + " " + doc[token.i + 1].text).lower()
-                if bigram in tech_skills:
-                    skills.add(bigram)
-        
-        return skills
+        # One pass of the compiled matcher finds skills of any length; labels are canonical
+        # skill IDs. Overlaps keep the longest match ("React Native" over "React").
+        from spacy.util import filter_spans
+        spans = filter_spans(get_skill_matcher(self.model)(doc, as_spans=True))
+        return {CANON.name(span.label_) for span in spans}
     
     def _analyze_experience(self, doc):
         """Analyze years of experience"""
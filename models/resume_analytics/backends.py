@@ -0,0 +1,26 @@
+"""
+Resume analytics backend selection.
+
+``spacy`` runs the analytics on the shared spaCy pipeline; ``lite`` gives
+the same result keys from plain string processing and never imports spaCy,
+for containers where the model's memory and load time matter. The default
+comes from ``RESUME_ANALYTICS_BACKEND``.
+"""
+import os
+
+from resume_analytics.nlp_registry import DEFAULT_MODEL
+
+BACKENDS = ("spacy", "lite")
+DEFAULT_BACKEND = os.getenv("RESUME_ANALYTICS_BACKEND", "spacy").strip().lower()
+
+
+def create_analyzer(backend=None, model=DEFAULT_MODEL):
+    """A resume analytics analyzer for ``backend``, ``DEFAULT_BACKEND`` if not given"""
+    backend = (backend or DEFAULT_BACKEND).strip().lower()
+    if backend == "lite":
+        from resume_analytics.lite_analyzer import LiteResumeAnalyzer
+        return LiteResumeAnalyzer(model)
+    if backend == "spacy":
+        from resume_analytics.analyzer import ResumeAnalyzer
+        return ResumeAnalyzer(model)
+    raise ValueError(f"Unknown resume analytics backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
@@ -0,0 +1,224 @@
+"""
+spaCy-free resume analytics for low-memory deployments.
+
+Produces the same result as the spaCy backend from plain string
+processing: a regex sentencizer that follows the tokenizer's and
+sentencizer's punctuation rules, skills found by one scan of a shared
+keyword automaton holding every spelling SkillCanon knows, and a compiled
+"N years" pattern for experience. Tokens are only approximated, so text
+full of code or markup can differ slightly; compare_analytics_backends.py
+measures the parity on real resumes.
+"""
+import re
+from functools import lru_cache
+
+from resume_analytics.analyzer import ResumeAnalyzer
+from utils.keyword_automaton import KeywordAutomaton
+from utils.skill_canon import CANON
+
+# Whitespace-delimited chunks; spaCy's tokenizer only splits further inside them
+CHUNK = re.compile(r'\S+')
+# "hi.Then": the tokenizer splits a period between a lower- and an uppercase letter
+INFIX_PERIOD = re.compile(r'(?<=[a-z])\.(?=[A-Z])')
+WORD = re.compile(r'\w')
+# "!" or "?" split off the front of a chunk ("![badge]") ends a sentence too
+LEADING_END = re.compile(r'[^\w]*?[!?]')
+SENTENCE_PUNCT = frozenset('.!?։؟۔।॥。！？')
+SENTENCE_CHAR = re.compile('[' + ''.join(sorted(SENTENCE_PUNCT)) + ']')
+OPENING_PUNCT = '"\'`“‘([{<*'
+CLOSING_PUNCT = '"\'`”’)]}>*'
+# Abbreviations spaCy's English tokenizer keeps whole, so their period ends no sentence;
+# single letters ("J.", "x.") are handled by rule. A best-effort subset of the
+# tokenizer's exceptions, covering those seen in resumes rather than all of them.
+ABBREVIATIONS = frozenset("""
+    Adm. Ak. Ala. Apr. Ariz. Ark. Aug. Bros. Calif. Co. Colo. Conn. Corp. D.C. Dec. Del. Dr.
+    E.G. E.g. Feb. Fla. Ga. Gen. Gov. I.E. I.e. Ia. Id. Ill. Inc. Ind. Jan. Jr. Jul. Jun. Kan.
+    Kans. Ky. La. Ltd. Mar. Mass. Md. Messrs. Mich. Minn. Miss. Mo. Mont. Mr. Mrs. Ms. Mt.
+    N.C. N.D. N.H. N.J. N.M. N.Y. Neb. Nebr. Nev. Nov. Oct. Okla. Ore. Pa. Ph.D. Prof. Rep.
+    Rev. S.C. Sen. Sep. Sept. St. Tenn. Va. Wash. Wis. a.m. co. e.g. i.e. p.m. v.s. vs.
+""".split())
+# Punctuation the tokenizer splits off the start and end of a chunk, and
+# between two letters or digits inside one ("Python/Django", "front-end")
+PREFIX_PUNCT = '"\'`“‘([{<$#*•'
+SUFFIX_PUNCT = '"\'`”’)]}>.,;:!?%*'
+INFIX_PUNCT = '/-–—,:'
+# URLs are single tokens, so nothing inside one is a skill
+URL = re.compile(r'(?:https?://|www\.)\S+')
+# A whole number token followed by a token containing "year" ("5 years", "(10 Years)")
+YEARS_OF_EXPERIENCE = re.compile(r'(?<![^\s(\[{"\'$])(\d+)\s+[^\W\d_]*year', re.IGNORECASE)
+
+
+def _build_skill_automaton():
+    automaton = KeywordAutomaton()
+    for alias, skill_id in CANON.aliases.items():
+        automaton.add(alias, skill_id)
+    return automaton.build()
+
+
+def _starts_token(text, index):
+    """Whether the tokenizer starts a token at ``text[index]``"""
+    if index == 0 or text[index - 1].isspace():
+        return True
+    if text[index - 1] in INFIX_PUNCT and index > 1 and text[index - 2].isalnum():
+        return True
+    # Only prefix punctuation between here and the start of the chunk
+    while index and text[index - 1] in PREFIX_PUNCT:
+        index -= 1
+    return index == 0 or text[index - 1].isspace()
+
+
+def _ends_token(text, index):
+    """Whether the tokenizer ends a token just before ``text[index]``"""
+    if index == len(text) or text[index].isspace():
+        return True
+    if text[index] in INFIX_PUNCT and index + 1 < len(text) and text[index + 1].isalnum():
+        return True
+    if text.startswith("'s", index) or text.startswith("’s", index):
+        index += 2
+    # Only suffix punctuation between here and the end of the chunk
+    while index < len(text) and text[index] in SUFFIX_PUNCT:
+        index += 1
+    return index == len(text) or text[index].isspace()
+
+
+# Every skill spelling, tagged with its canonical ID; shared by every instance
+SKILL_AUTOMATON = _build_skill_automaton()
+
+
+def _is_abbreviation(chunk):
+    """Whether the tokenizer keeps ``chunk`` whole as an abbreviation, once punctuation is split off"""
+    core = chunk.lstrip(PREFIX_PUNCT)
+    while core and core not in ABBREVIATIONS:
+        if core[-1] not in SUFFIX_PUNCT:
+            return False
+        core = core[:-1]
+    return bool(core)
+
+
+def _ends_sentence(chunk):
+    """Whether the tokenizer splits a sentence-ending punctuation token off the end of ``chunk``"""
+    core = chunk.rstrip(CLOSING_PUNCT)
+    if not core or core[-1] not in SENTENCE_PUNCT:
+        return False
+    if core[-1] != '.' or core == '.':
+        return True
+    # "..." is one token, and not sentence punctuation
+    if core.endswith('..'):
+        return False
+    core = core.lstrip(OPENING_PUNCT)
+    if len(core) < 2:
+        return True
+    if core in ABBREVIATIONS or (len(core) == 2 and core[0].isalpha()):
+        return False
+    # A final period is split off after a lowercase letter, a digit or a symbol,
+    # and after two capitals ("AWS."), but not after initials ("I.B.M.")
+    before = core[-2]
+    return not before.isupper() or core[-3].isupper()
+
+
+@lru_cache(maxsize=8192)
+def _line_sentences(line):
+    """Sentences starting inside one line, and whether the line ends right after a sentence end.
+
+    A line break is a whitespace token, so it starts the next sentence when
+    one is pending and every line starts with nothing pending. This is a
+    best-effort model of the tokenizer plus sentencizer, not a port: it
+    agrees on ordinary prose and resume text, and compare_analytics_backends.py
+    reports where real inputs still differ.
+    """
+    if not SENTENCE_CHAR.search(line):
+        return 0, False
+    starts, seen_end, position = 0, False, 0
+    for match in CHUNK.finditer(line):
+        # Whitespace other than a single space is a token of its own
+        if seen_end and line[position:match.start()] != ' ':
+            starts += 1
+            seen_end = False
+        chunk = match.group()
+        has_word = WORD.search(chunk) is not None
+        if has_word and (seen_end or LEADING_END.match(chunk)):
+            starts += 1
+            seen_end = False
+        if not _is_abbreviation(chunk):
+            starts += len(INFIX_PERIOD.findall(chunk))
+        seen_end = _ends_sentence(chunk) or (seen_end and not has_word)
+        position = match.end()
+    return starts, seen_end
+
+
+@lru_cache(maxsize=8192)
+def _line_skills(line):
+    """Display names of the skills in one line; no skill spans a line break"""
+    lower = line.lower()
+    urls = [match.span() for match in URL.finditer(lower)]
+    spans = []
+    for start, keyword in SKILL_AUTOMATON.iter_matches(lower):
+        end = start + len(keyword)
+        # Only whole tokens count: "java" is not a skill inside "javascript" or "java_home"
+        if not (_starts_token(lower, start) and _ends_token(lower, end)):
+            continue
+        if any(url_start <= start < url_end for url_start, url_end in urls):
+            continue
+        spans.append((start, end, keyword))
+
+    # Overlaps keep the longest match ("React Native" over "React")
+    taken = []
+    skills = set()
+    for start, end, keyword in sorted(spans, key=lambda span: (span[0] - span[1], span[0])):
+        if any(start < other_end and other_start < end for other_start, other_end in taken):
+            continue
+        taken.append((start, end))
+        skills.update(CANON.name(skill_id) for skill_id in SKILL_AUTOMATON.tags[keyword])
+    return frozenset(skills)
+
+
+class LiteResumeAnalyzer(ResumeAnalyzer):
+    """ResumeAnalyzer that never imports spaCy; the "document" is the text itself"""
+
+    def __init__(self, model=None):
+        # Kept for a drop-in signature; no model is loaded
+        self.model = model
+
+    @property
+    def nlp(self):
+        raise AttributeError("LiteResumeAnalyzer has no spaCy pipeline")
+
+    def analyze_resume(self, resume_text):
+        """Analyze resume text and return metrics"""
+        return self._analyze_doc(resume_text, resume_text)
+
+    def analyze_batch(self, texts, batch_size=64, n_process=1, as_tuples=False):
+        """Same contract as ResumeAnalyzer.analyze_batch; texts are analyzed one by one
+        in this process, so ``batch_size`` and ``n_process`` are ignored"""
+        if as_tuples:
+            for text, context in texts:
+                yield self.analyze_resume(text), context
+        else:
+            for text in texts:
+                yield self.analyze_resume(text)
+
+    def _count_sentences(self, text):
+        """Number of sentences, split the way spaCy's sentencizer splits the tokenized text.
+        
+        A sentence ends at a standalone ".", "!" or "?" token and the next one
+        starts at the first following token that is not punctuation. Lines are
+        counted separately and cached, as most lines repeat across resumes.
+        """
+        if not text:
+            return 0
+        *lines, last = text.split('\n')
+        sentences = 1
+        for line in lines:
+            starts, pending = _line_sentences(line)
+            sentences += starts + pending
+        starts, pending = _line_sentences(last)
+        trailing = last[len(last.rstrip()):]
+        return sentences + starts + (pending and trailing not in ('', ' '))
+
+    def _extract_skills(self, text):
+        """Extract skills from resume"""
+        return set().union(*map(_line_skills, text.split('\n')))
+
+    def _analyze_experience(self, text):
+        """Analyze years of experience"""
+        return max((int(years) for years in YEARS_OF_EXPERIENCE.findall(text)), default=0)
@@ -0,0 +1,85 @@
+"""
+Process-wide spaCy pipelines for resume analytics.
+
+The analytics only read tokens, ``like_num`` and sentence boundaries, so
+the model is loaded without its trained components (tagger, parser,
+lemmatizer, NER, ...) and a rule-based sentencizer stands in for the
+parser. Each model is loaded once per process, on first use, and shared
+by every analyzer instance; ``pipeline_stats`` reports how long the load
+took and how much memory it added.
+"""
+import os
+import threading
+import time
+
+DEFAULT_MODEL = os.getenv("RESUME_SPACY_MODEL", "en_core_web_sm")
+# Trained components the analytics never read; excluded so they are not even loaded
+EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+_lock = threading.Lock()
+_pipelines = {}
+_stats = {}
+
+
+def rss_bytes():
+    """Resident memory of this process, or None where it cannot be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def _load(model):
+    import spacy
+
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    nlp = spacy.load(model, exclude=EXCLUDED_COMPONENTS)
+    nlp.add_pipe("sentencizer")
+    load_seconds = time.perf_counter() - start
+    rss_after = rss_bytes()
+    _stats[model] = {
+        'load_seconds': load_seconds,
+        'rss_before_bytes': rss_before,
+        'rss_after_bytes': rss_after,
+        'rss_added_bytes': rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+        'components': list(nlp.pipe_names),
+        'warm_up_seconds': None
+    }
+    return nlp
+
+
+def get_nlp(model=DEFAULT_MODEL):
+    """The shared trimmed pipeline for ``model``, loaded on first call"""
+    nlp = _pipelines.get(model)
+    if nlp is None:
+        with _lock:
+            nlp = _pipelines.get(model)
+            if nlp is None:
+                nlp = _pipelines[model] = _load(model)
+    return nlp
+
+
+def warm_up(model=DEFAULT_MODEL):
+    """Load ``model`` and run one small document through it, e.g. at app start-up.
+
+    Returns the model's stats, see ``pipeline_stats``.
+    """
+    nlp = get_nlp(model)
+    start = time.perf_counter()
+    nlp("Warm-up sentence with 3 years of Python. Another sentence.")
+    _stats[model]['warm_up_seconds'] = time.perf_counter() - start
+    return dict(_stats[model])
+
+
+def pipeline_stats():
+    """Load time, memory added and components of every loaded model, keyed by model name"""
+    return {model: dict(stats) for model, stats in _stats.items()}
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the app's packages (utils, config, resume_analytics) the way app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
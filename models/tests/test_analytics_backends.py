@@ -0,0 +1,50 @@
+import pytest
+
+from resume_analytics.analyzer import ResumeAnalyzer
+from resume_analytics.lite_analyzer import LiteResumeAnalyzer
+from resume_analytics.nlp_registry import DEFAULT_MODEL, get_nlp
+
+RESUMES = [
+    # Abbreviations keep their period, so none of these end a sentence
+    "Dr. Jane Smith, Ph.D.\nWorked at Acme Inc. in N.Y. on tools, e.g. Python and SQL. Mr. Lee vs. Ms. Ray.",
+    # "..." is one token and not sentence punctuation
+    "Skills: Python... Java... and more... Then Docker. Done!",
+    # Nothing inside a URL is a skill
+    "Portfolio: https://github.com/jane/react-python-docker and www.example.com/java.\nPython developer.",
+    # The longer skill wins an overlap
+    "Built apps in React Native. Later moved to React and Node.js.",
+    # Years of experience
+    "5 years of Python, (10 Years) in Java and 3+ years of SQL.\nSenior engineer with 7 years total.",
+]
+
+
+@pytest.fixture(scope="module")
+def lite_analyzer():
+    return LiteResumeAnalyzer(DEFAULT_MODEL)
+
+
+@pytest.fixture(scope="module")
+def spacy_analyzer():
+    # Only the parity tests need spaCy; the lite backend is tested without it
+    pytest.importorskip("spacy")
+    try:
+        get_nlp(DEFAULT_MODEL)
+    except OSError:
+        pytest.skip(f"spaCy model {DEFAULT_MODEL!r} is not installed")
+    return ResumeAnalyzer(DEFAULT_MODEL)
+
+
+@pytest.mark.parametrize("text", RESUMES)
+def test_backends_agree(spacy_analyzer, lite_analyzer, text):
+    expected, actual = spacy_analyzer.analyze_resume(text), lite_analyzer.analyze_resume(text)
+    assert actual['metrics'] == expected['metrics']
+    assert sorted(actual['skills']) == sorted(expected['skills'])
+
+
+def test_react_native_is_not_also_react(lite_analyzer):
+    skills = lite_analyzer.analyze_resume("Mobile apps in React Native.")['skills']
+    assert "React Native" in skills and "React" not in skills
+
+
+def test_years_of_experience(lite_analyzer):
+    assert lite_analyzer.analyze_resume(RESUMES[4])['metrics']['experience_years'] == 10
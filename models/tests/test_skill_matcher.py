@@ -0,0 +1,56 @@
+import pytest
+
+from utils.skill_matcher import SKILL_MATCHER, extra_matcher, is_close
+
+
+@pytest.mark.parametrize("typo, skill", [
+    ("pyhton", "python"),
+    ("kubernets", "kubernetes"),
+    ("javscript", "javascript"),
+    ("angualr", "angular"),
+    ("leadershp", "leadership"),
+    ("marketting", "marketing"),
+])
+def test_typos_match(typo, skill):
+    assert is_close(typo, skill)
+
+
+@pytest.mark.parametrize("word, skill", [
+    ("nesting", "testing"),
+    ("tasting", "testing"),
+    ("resign", "design"),
+    ("could", "cloud"),
+])
+def test_words_one_letter_from_a_skill_do_not_match(word, skill):
+    assert not is_close(word, skill)
+
+
+def test_required_skills_outside_the_canon():
+    matcher = extra_matcher(frozenset(["Testing", "Cloud", "Design"]))
+    assert matcher.match("Nesting") == frozenset()
+    assert matcher.match("could") == frozenset()
+    assert matcher.match("Resign") == frozenset()
+    assert matcher.match("Designs") == frozenset(["design"])
+
+
+def test_canon_spellings_and_typos():
+    assert SKILL_MATCHER.match("Pyhton") == frozenset(["python"])
+    assert SKILL_MATCHER.match("Postgres") == frozenset(["postgresql"])
+    assert SKILL_MATCHER.match("Dockr") == frozenset()
+
+
+@pytest.mark.parametrize("word", ["Node", "Mongo", "REST", "Torch", "Express"])
+def test_bare_words_are_not_skills(word):
+    assert SKILL_MATCHER.match(word) == frozenset()
+
+
+@pytest.mark.parametrize("spelling, skill_id", [
+    ("Node.js", "nodejs"),
+    ("NodeJS", "nodejs"),
+    ("MongoDB", "mongodb"),
+    ("PyTorch", "pytorch"),
+    ("REST APIs", "restfulapis"),
+    ("RESTful", "restfulapis"),
+])
+def test_unambiguous_spellings_still_match(spelling, skill_id):
+    assert SKILL_MATCHER.match(spelling) == frozenset([skill_id])
@@ -1,10 +1,31 @@
 """
 Utils package for Smart Resume AI
+
+The classes below are imported on first access, so importing a light
+module such as ``utils.skill_canon`` does not load Streamlit, Gemini,
+python-docx or SQLAlchemy.
 """
+from importlib import import_module
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'ResumeAnalyzer': '.resume_analyzer',
+    'ResumeBuilder': '.resume_builder',
+    'ResumeParser': '.resume_parser',
+    'ExcelManager': '.excel_manager',
+    'AIResumeAnalyzer': '.ai_resume_analyzer',
+}
+_EXPORTS.update(dict.fromkeys([
+    'Base', 'Resume', 'Analysis', 'AIAnalysis', 'DatabaseManager', 'get_database_connection',
+    'save_resume_data', 'save_ai_analysis_data', 'get_ai_analysis_statistics'
+], '.database'))
+
+__all__ = list(_EXPORTS)
+
 
-from .resume_analyzer import ResumeAnalyzer
-from .resume_builder import ResumeBuilder
-from .resume_parser import ResumeParser
-from .excel_manager import ExcelManager
-from .database import * 
-from .ai_resume_analyzer import AIResumeAnalyzer
\ No newline at end of file
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
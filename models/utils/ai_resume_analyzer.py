@@ -2,15 +2,21 @@ import os
 import streamlit as st
 from dotenv import load_dotenv
 import google.generativeai as genai
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
-import tempfile
 import requests
 import json
 import math
 import re
 
+from .docx_reader import docx_text
+from .extraction_cache import get_extraction_cache, read_upload_bytes
+from .llm_cache import get_llm_cache, response_key
+from .text_extractor import extract_pdf_pages, join_pages
+
+
+GEMINI_MODEL = "gemini-1.5-flash"
+# Part of the response cache key, so changing it never serves answers generated under the old config
+GEMINI_GENERATION_CONFIG = {}
+
 
 class AIResumeAnalyzer:
     def __init__(self):
@@ -23,166 +29,76 @@ class AIResumeAnalyzer:
         
         if self.google_api_key:
             genai.configure(api_key=self.google_api_key)
+        
+        # Stored responses, so repeating an analysis costs no API quota; None when disabled
+        self.response_cache = get_llm_cache()
     
     def extract_text_from_pdf(self, pdf_file):
         """Extract text from PDF using pdfplumber and OCR if needed"""
-        text = ""
-        
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            if hasattr(pdf_file, 'getbuffer'):
-                temp_file.write(pdf_file.getbuffer())
-            elif hasattr(pdf_file, 'read'):
-                temp_file.write(pdf_file.read())
-                pdf_file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                temp_file.write(pdf_file)
-            temp_path = temp_file.name
-        
+        file_content = read_upload_bytes(pdf_file)
+        return get_extraction_cache().get_or_extract(
+            'ai-pdf', file_content, lambda: self._extract_pdf_text(file_content)
+        )
+
+    def _extract_pdf_text(self, file_content):
         try:
-            # Try direct text extraction with pdfplumber
-            try:
-                with pdfplumber.open(temp_path) as pdf:
-                    for page in pdf.pages:
-                        try:
-                            # Suppress specific warnings about PDFColorSpace conversion
-                            import warnings
-                            with warnings.catch_warnings():
-                                warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
-                                warnings.filterwarnings("ignore", message=".*Cannot convert.*")
-                                page_text = page.extract_text()
-                                if page_text:
-                                    text += page_text + "\n"
-                        except Exception as e:
-                            # Don't show these specific errors to the user
-                            if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
-                                st.warning(f"Error extracting text from page with pdfplumber: {e}")
-            except Exception as e:
-                st.warning(f"pdfplumber extraction failed: {e}")
-            
-            # If pdfplumber extraction worked, return the text
-            if text.strip():
-                os.unlink(temp_path)  # Clean up the temp file
-                return text.strip()
-            
-            # Try PyPDF2 as a fallback
-            st.info("Trying PyPDF2 extraction method...")
-            try:
-                import PyPDF2
-                pdf_text = ""
-                with open(temp_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            pdf_text += page_text + "\n"
-                
-                if pdf_text.strip():
-                    os.unlink(temp_path)  # Clean up the temp file
-                    return pdf_text.strip()
-            except Exception as e:
-                st.warning(f"PyPDF2 extraction failed: {e}")
-            
-            # If we got here, both extraction methods failed
-            st.warning("Standard text extraction methods failed. Your PDF might be image-based or scanned.")
-            
-            # Try OCR as a last resort
-            try:
-                # Check if we can import the required OCR libraries
-                import pytesseract
-                from pdf2image import convert_from_path
-                
-                st.info("Attempting OCR for image-based PDF. This may take a moment...")
-                
-                # Check if poppler is installed
-                poppler_path = None
-                if os.name == 'nt':  # Windows
-                    # Try to find poppler in common locations
-                    possible_paths = [
-                        r'C:\poppler\Library\bin',
-                        r'C:\Program Files\poppler\bin',
-                        r'C:\Program Files (x86)\poppler\bin',
-                        r'C:\poppler\bin'
-                    ]
-                    for path in possible_paths:
-                        if os.path.exists(path):
-                            poppler_path = path
-                            st.success(f"Found Poppler at: {path}")
-                            break
-                    
-                    if not poppler_path:
-                        st.warning("Poppler not found in common locations. Using default path: C:\\poppler\\Library\\bin")
-                        poppler_path = r'C:\poppler\Library\bin'
-                
-                # Try to convert PDF to images
-                try:
-                    if poppler_path and os.name == 'nt':
-                        images = convert_from_path(temp_path, poppler_path=poppler_path)
-                    else:
-                        images = convert_from_path(temp_path)
-                    
-                    # Process each image with OCR
-                    ocr_text = ""
-                    for i, image in enumerate(images):
-                        st.info(f"Processing page {i+1} with OCR...")
-                        page_text = pytesseract.image_to_string(image)
-                        ocr_text += page_text + "\n"
-                    
-                    if ocr_text.strip():
-                        os.unlink(temp_path)  # Clean up the temp file
-                        return ocr_text.strip()
-                    else:
-                        st.error("OCR extraction yielded no text. Please check if the PDF contains actual text content.")
-                except Exception as e:
-                    st.error(f"PDF to image conversion failed: {e}")
-                    st.info("If you're on Windows, make sure Poppler is installed and in your PATH.")
-                    st.info("Download Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
-            except ImportError as e:
-                st.error(f"OCR libraries not available: {e}")
+            # Read each page from its text layer and only OCR the image-only pages
+            pages, errors = extract_pdf_pages(file_content)
+        except Exception as e:
+            st.error(f"PDF processing failed: {e}")
+            pages, errors = [], []
+
+        text = join_pages(pages)
+        if text:
+            ocr_pages = [page['page'] for page in pages if page['backend'] == 'ocr']
+            if ocr_pages:
+                st.info(f"Read scanned page(s) {', '.join(map(str, ocr_pages))} with OCR.")
+            return text
+
+        # Explain why nothing could be extracted
+        st.warning("Standard text extraction methods failed. Your PDF might be image-based or scanned.")
+        for error in errors:
+            if not error.startswith("ocr:"):
+                st.warning(f"Extraction failed: {error}")
+            elif "No module named" in error:
+                st.error(f"OCR libraries not available: {error}")
                 st.info("Please install the required OCR libraries:")
                 st.code("pip install pytesseract pdf2image")
                 st.info("For Windows, also download and install:")
                 st.info("1. Tesseract OCR: https://github.com/UB-Mannheim/tesseract/wiki")
                 st.info("2. Poppler: https://github.com/oschwartz10612/poppler-windows/releases/")
-            except Exception as e:
-                st.error(f"OCR processing failed: {e}")
-        
-        except Exception as e:
-            st.error(f"PDF processing failed: {e}")
-        
-        # Clean up the temp file
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
-        
+            else:
+                st.error(f"PDF to image conversion failed: {error}")
+                st.info("If you're on Windows, make sure Poppler is installed and in your PATH.")
+                st.info("Download Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
+
         # If all extraction methods failed, return an empty string
         st.error("All text extraction methods failed. Please try a different PDF or manually extract the text.")
         return ""
     
     def extract_text_from_docx(self, docx_file):
         """Extract text from DOCX file"""
-        from docx import Document
-        
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-            temp_file.write(docx_file.getbuffer())
-            temp_path = temp_file.name
-        
+        file_content = read_upload_bytes(docx_file)
+        return get_extraction_cache().get_or_extract(
+            'ai-docx', file_content, lambda: self._extract_docx_text(file_content)
+        )
+
+    def _extract_docx_text(self, file_content):
         text = ""
         try:
-            doc = Document(temp_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+            text = docx_text(file_content) + "\n"
         except Exception as e:
             st.error(f"Error extracting text from DOCX: {e}")
         
-        os.unlink(temp_path)  # Clean up the temp file
         return text
     
-    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None):
-        """Analyze resume using Google Gemini AI"""
+    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None, bypass_cache=False):
+        """Analyze resume using Google Gemini AI
+        
+        A response cached for the same model, prompt and generation config is
+        returned without calling the API; ``bypass_cache`` asks the model
+        again and replaces the cached response.
+        """
         if not resume_text:
             return {"error": "Resume text is required for analysis."}
         
@@ -190,8 +106,6 @@ class AIResumeAnalyzer:
             return {"error": "Google API key is not configured. Please add it to your .env file."}
         
         try:
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            
             base_prompt = f"""
             You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Your task is to provide a comprehensive, detailed analysis of the resume provided.
             
@@ -257,6 +171,18 @@ class AIResumeAnalyzer:
                 [List specific requirements from the job description that are not addressed in the resume, with recommendations on how to address each gap]
                 """
             
+            cache_key = response_key(GEMINI_MODEL, base_prompt, GEMINI_GENERATION_CONFIG)
+            if self.response_cache is not None and not bypass_cache:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return {
+                        "analysis": cached["analysis"],
+                        "resume_score": cached["resume_score"],
+                        "ats_score": cached["ats_score"],
+                        "cached": True
+                    }
+            
+            model = genai.GenerativeModel(GEMINI_MODEL, generation_config=GEMINI_GENERATION_CONFIG)
             response = model.generate_content(base_prompt)
             analysis = response.text.strip()
             
@@ -266,10 +192,14 @@ class AIResumeAnalyzer:
             # Extract ATS score if present
             ats_score = self._extract_ats_score_from_text(analysis)
             
+            if self.response_cache is not None and analysis:
+                self.response_cache.set(cache_key, GEMINI_MODEL, analysis, resume_score, ats_score)
+            
             return {
                 "analysis": analysis,
                 "resume_score": resume_score,
-                "ats_score": ats_score
+                "ats_score": ats_score,
+                "cached": False
             }
         
         except Exception as e:
@@ -1187,7 +1117,7 @@ class AIResumeAnalyzer:
             print(f"Error extracting ATS score: {str(e)}")
             return 0
             
-    def analyze_resume(self, resume_text, job_role=None, role_info=None, model="Google Gemini"):
+    def analyze_resume(self, resume_text, job_role=None, role_info=None, model="Google Gemini", bypass_cache=False):
         """
         Analyze a resume using the specified AI model
         
@@ -1196,6 +1126,7 @@ class AIResumeAnalyzer:
         - job_role: The target job role
         - role_info: Additional information about the job role
         - model: The AI model to use ("Google Gemini" or "Anthropic Claude")
+        - bypass_cache: Ask the model again instead of using a cached Gemini response
         
         Returns:
         - Dictionary containing analysis results
@@ -1213,7 +1144,7 @@ class AIResumeAnalyzer:
             
             # Choose the appropriate model for analysis
             if model == "Google Gemini":
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
+                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role, bypass_cache)
                 model_used = "Google Gemini"
             elif model == "Anthropic Claude":
                 result = self.analyze_resume_with_anthropic(resume_text, job_description, job_role)
@@ -1221,7 +1152,7 @@ class AIResumeAnalyzer:
                 model_used = result.get("model_used", "Anthropic Claude")
             else:
                 # Default to Gemini if model not recognized
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
+                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role, bypass_cache)
                 model_used = "Google Gemini"
             
             # Process the result to extract structured information
@@ -0,0 +1,157 @@
+"""
+Memoized results of the rule-based resume analysis.
+
+Results are keyed by a hash of the normalized resume text plus a hash of
+the role requirements it was scored against, so a Streamlit rerun, a
+repeated view or switching back to an earlier role returns the stored
+result instead of analyzing again. A bounded in-memory LRU sits in front of
+an optional SQLite table that keeps results across process restarts. The
+table drops rows from other analysis versions when it is opened, rows
+older than a TTL, and the oldest rows beyond a row cap.
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Bump when the scoring changes so persisted results from older code are not reused
+ANALYSIS_VERSION = "6"
+
+DEFAULT_MAX_ITEMS = int(os.getenv("RESUME_ANALYSIS_CACHE_ITEMS", "256"))
+DEFAULT_MAX_ROWS = int(os.getenv("RESUME_ANALYSIS_CACHE_ROWS", "10000"))
+DEFAULT_TTL_SECONDS = int(os.getenv("RESUME_ANALYSIS_CACHE_TTL", str(30 * 24 * 3600)))
+DEFAULT_DB_PATH = os.getenv(
+    "RESUME_ANALYSIS_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "analysis.db")
+)
+
+
+def normalize_text(text):
+    """Line endings unified and trailing whitespace dropped, so equivalent texts share a key"""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip('\n')
+
+
+def analysis_key(normalized_text, job_requirements):
+    """Cache key for a normalized text scored against ``job_requirements``"""
+    text_hash = hashlib.sha256(normalized_text.encode('utf-8')).hexdigest()
+    role = json.dumps(job_requirements, sort_keys=True, default=str)
+    role_hash = hashlib.sha256(role.encode('utf-8')).hexdigest()[:16]
+    return f"v{ANALYSIS_VERSION}-{text_hash}-{role_hash}"
+
+
+class AnalysisCache:
+    def __init__(self, max_items=DEFAULT_MAX_ITEMS, db_path=None, max_rows=DEFAULT_MAX_ROWS,
+                 ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_items = max_items
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'db_hits': 0, 'misses': 0}
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                self._execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                ''')
+                self._execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_created_at ON analysis_cache (created_at)')
+                # Results from other scoring versions can never be hit again
+                self._execute('DELETE FROM analysis_cache WHERE key NOT LIKE ?', (f"v{ANALYSIS_VERSION}-%",))
+            except (OSError, sqlite3.Error) as e:
+                # An unwritable or locked location leaves only the in-memory LRU
+                print(f"Analysis cache is not persisted: {e}")
+                self.db_path = None
+
+    def _execute(self, query, params=()):
+        return self._transaction((query, params))
+
+    def _transaction(self, *statements):
+        """Run ``(query, params)`` statements in one transaction; returns the last one's first row"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            row = None
+            for query, params in statements:
+                row = conn.execute(query, params).fetchone()
+            conn.commit()
+            return row
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """Return a copy of the cached result, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats['hits'] += 1
+                return copy.deepcopy(self._memory[key])
+
+        result = self._read_db(key)
+        with self._lock:
+            if result is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['db_hits'] += 1
+            self._remember(key, result)
+        return copy.deepcopy(result)
+
+    def set(self, key, result):
+        """Store a result, then drop expired rows and the oldest ones beyond max_rows"""
+        with self._lock:
+            self._remember(key, copy.deepcopy(result))
+        if self.db_path:
+            try:
+                self._transaction(
+                    ('INSERT OR REPLACE INTO analysis_cache (key, result) VALUES (?, ?)',
+                     (key, json.dumps(result, default=str))),
+                    ("DELETE FROM analysis_cache WHERE created_at < datetime('now', ?)",
+                     (f"-{self.ttl_seconds} seconds",)),
+                    ('DELETE FROM analysis_cache WHERE key IN ('
+                     'SELECT key FROM analysis_cache ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?)',
+                     (self.max_rows,))
+                )
+            except sqlite3.Error as e:
+                print(f"Could not persist analysis result: {e}")
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _read_db(self, key):
+        if not self.db_path:
+            return None
+        try:
+            row = self._execute('SELECT result FROM analysis_cache WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            print(f"Could not read cached analysis: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            self._execute('DELETE FROM analysis_cache')
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    """Process-wide cache, persisted to RESUME_ANALYSIS_CACHE_DB unless it is set empty"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = AnalysisCache(db_path=DEFAULT_DB_PATH or None)
+        return _shared_cache
@@ -0,0 +1,110 @@
+"""
+Streaming DOCX text reader.
+
+Opens the DOCX zip directly and walks ``word/document.xml`` (plus the
+header and footer parts) with an incremental XML parser instead of building
+the python-docx object model. Paragraphs are emitted in document order,
+including the ones inside table cells and text boxes, which
+``Document.paragraphs`` silently skips. Elements are cleared as soon as
+they have been read, so memory stays flat however long the document is.
+"""
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+PARAGRAPH = W_NS + "p"
+TEXT = W_NS + "t"
+# Run-level elements that stand for a character rather than carrying text
+CHARACTERS = {
+    W_NS + "tab": "\t",
+    W_NS + "br": "\n",
+    W_NS + "cr": "\n",
+    W_NS + "noBreakHyphen": "-",
+}
+
+HEADER_PATTERN = re.compile(r"^word/header(\d*)\.xml$")
+FOOTER_PATTERN = re.compile(r"^word/footer(\d*)\.xml$")
+
+
+def _numbered_parts(names, pattern):
+    parts = [(int(match.group(1) or 0), name) for name in names for match in [pattern.match(name)] if match]
+    return [name for _, name in sorted(parts)]
+
+
+def iter_part_paragraphs(stream):
+    """Yield the text of every paragraph in one WordprocessingML part.
+
+    Table cells and text boxes are made of ordinary paragraphs, so they come
+    out in the order they appear. A text box nested in a paragraph is
+    yielded just before the paragraph that anchors it. The VML copy Word
+    keeps under ``mc:Fallback`` for old readers is skipped so text boxes are
+    not read twice.
+    """
+    buffers = []
+    stack = []
+    fallback_depth = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif tag == PARAGRAPH and not fallback_depth:
+                buffers.append([])
+            continue
+
+        stack.pop()
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == TEXT and buffers:
+            buffers[-1].append(elem.text or "")
+        elif tag in CHARACTERS and buffers:
+            buffers[-1].append(CHARACTERS[tag])
+        elif tag == PARAGRAPH:
+            yield "".join(buffers.pop())
+
+        # Once a top-level block is done nothing inside it is needed again
+        if len(stack) <= 2 and stack:
+            stack[-1].clear()
+
+
+def iter_docx_paragraphs(file_content):
+    """Yield paragraph text from headers, the body and footers of a DOCX.
+
+    ``file_content`` is the raw DOCX bytes. Header and footer text that
+    repeats across sections (first-page, even and default variants) is
+    only yielded once.
+    """
+    with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+        names = archive.namelist()
+        if "word/document.xml" not in names:
+            raise ValueError("Not a Word document: word/document.xml is missing")
+
+        seen = set()
+        for name in _numbered_parts(names, HEADER_PATTERN):
+            with archive.open(name) as stream:
+                for text in iter_part_paragraphs(stream):
+                    if text.strip() and text not in seen:
+                        seen.add(text)
+                        yield text
+
+        with archive.open("word/document.xml") as stream:
+            yield from iter_part_paragraphs(stream)
+
+        for name in _numbered_parts(names, FOOTER_PATTERN):
+            with archive.open(name) as stream:
+                for text in iter_part_paragraphs(stream):
+                    if text.strip() and text not in seen:
+                        seen.add(text)
+                        yield text
+
+
+def docx_text(file_content):
+    """Full text of a DOCX, one paragraph per line"""
+    return "\n".join(iter_docx_paragraphs(file_content))
@@ -0,0 +1,195 @@
+"""
+Content-addressed cache for text extracted from uploaded resumes.
+
+Entries are keyed by a SHA-256 of the uploaded bytes plus the name and
+version of the extractor that produced them, so the same file always maps
+to the same entry no matter which widget or rerun asked for it, and text
+from an older extractor is never served. Lookups go through a small
+in-memory LRU first and fall back to a size-capped directory on disk.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Bump when an extractor's output changes (e.g. the DOCX reader picking up tables,
+# headers and footers) so text cached by the old code is not served again
+EXTRACTION_VERSION = "2"
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "RESUME_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "extraction")
+)
+DEFAULT_MEMORY_ITEMS = int(os.getenv("RESUME_CACHE_MEMORY_ITEMS", "128"))
+DEFAULT_DISK_BYTES = int(os.getenv("RESUME_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+
+
+def read_upload_bytes(file):
+    """Return the raw bytes of an upload without moving its file pointer"""
+    if isinstance(file, bytes):
+        return file
+    if isinstance(file, (bytearray, memoryview)):
+        return bytes(file)
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    if hasattr(file, 'read'):
+        position = file.tell() if hasattr(file, 'tell') else 0
+        file.seek(0)
+        content = file.read()
+        file.seek(position)
+        return content
+    raise TypeError(f"Unsupported upload type: {type(file).__name__}")
+
+
+def hash_bytes(data):
+    """Content hash used as the cache key for an upload"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_memory_items=DEFAULT_MEMORY_ITEMS,
+                 max_disk_bytes=DEFAULT_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def _key(self, namespace, digest):
+        return f"v{EXTRACTION_VERSION}-{namespace}-{digest}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[-2:], key + ".json")
+
+    def get(self, namespace, digest):
+        """Return the cached value for an upload, or None if it is not cached"""
+        key = self._key(namespace, digest)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return self._memory[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self._remember(key, value)
+        return value
+
+    def set(self, namespace, digest, value):
+        """Store a JSON-serialisable value for an upload in both tiers"""
+        key = self._key(namespace, digest)
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def get_or_extract(self, namespace, data, extract):
+        """Return cached text for ``data`` or run ``extract()`` and cache its result.
+
+        Empty results are not cached so a failed extraction is retried on the
+        next call instead of being remembered.
+        """
+        digest = hash_bytes(data)
+        value = self.get(namespace, digest)
+        if value is not None:
+            return value
+        value = extract()
+        if value:
+            self.set(namespace, digest, value)
+        return value
+
+    def clear(self):
+        """Drop every entry from memory and disk"""
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.cache_dir):
+            for path, size, mtime in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        if not self.max_disk_bytes:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            # Bump the mtime so disk eviction stays least-recently-used
+            os.utime(path, None)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, value):
+        if not self.max_disk_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(value, f)
+                os.replace(temp_path, path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._evict_disk()
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing extraction cache entry: {e}")
+
+    def _disk_entries(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict_disk(self):
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_disk_bytes:
+            return
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            if total <= self.max_disk_bytes:
+                break
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """Process-wide cache shared by every extractor"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ExtractionCache()
+        return _shared_cache
@@ -0,0 +1,189 @@
+"""
+Budgeted, process-isolated extraction.
+
+A malformed or enormous PDF can hang pdfplumber or pdf2image. Running the
+extraction in its own process lets the caller enforce a wall-clock budget
+(terminate the worker), a page budget (stop reading after N pages) and a
+memory budget (an address-space rlimit on POSIX), without stalling every
+other session served by the same Streamlit process.
+
+Pages are sent back to the parent as they are extracted, so when a budget is
+hit whatever was already finished is still returned with a clear status.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import time
+
+# Statuses an isolated extraction can end with
+STATUS_OK = "ok"
+STATUS_TRUNCATED = "truncated"   # page budget reached, remaining pages skipped
+STATUS_PARTIAL = "partial"       # time or memory budget hit after some pages finished
+STATUS_FALLBACK = "fallback"     # main extraction failed, light backend produced the text
+STATUS_TIMEOUT = "timeout"       # budgets exhausted with nothing extracted
+STATUS_FAILED = "failed"
+
+
+class ExtractionBudget:
+    def __init__(self, wall_seconds=60.0, max_pages=50, max_memory_mb=1024, fallback_seconds=15.0):
+        self.wall_seconds = wall_seconds
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.fallback_seconds = fallback_seconds
+
+    @classmethod
+    def from_env(cls):
+        """Budget configured through RESUME_EXTRACT_* environment variables"""
+        return cls(
+            wall_seconds=float(os.getenv("RESUME_EXTRACT_TIMEOUT", "60")),
+            max_pages=int(os.getenv("RESUME_EXTRACT_MAX_PAGES", "50")),
+            max_memory_mb=int(os.getenv("RESUME_EXTRACT_MAX_MEMORY_MB", "1024")),
+            fallback_seconds=float(os.getenv("RESUME_EXTRACT_FALLBACK_TIMEOUT", "15"))
+        )
+
+
+def _limit_memory(max_memory_mb):
+    if not max_memory_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        # No rlimits on Windows; the wall-clock budget still applies
+        return
+    limit = max_memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(file_content, file_type, max_pages, max_memory_mb, light, results):
+    """Entry point of the isolated process; reports back over ``results``"""
+    if hasattr(os, 'setpgid'):
+        # Own process group, so OCR pool workers are killed along with us
+        os.setpgid(0, 0)
+    _limit_memory(max_memory_mb)
+    try:
+        from .text_extractor import PDF_MIME, iter_upload_pages, probe_plan
+
+        plan = None
+        if file_type == PDF_MIME:
+            # The light backend skips the probe and OCR and only reads text with PyPDF2
+            plan = {'text_reader': 'pypdf2'} if light else probe_plan(file_content)
+            results.put(('probe', plan))
+        errors = []
+        for page_number, page_text, backend in iter_upload_pages(
+                file_content, file_type, errors, plan=plan, max_pages=max_pages, ocr=not light):
+            results.put(('page', page_number, page_text, backend))
+        results.put(('done', errors))
+    except MemoryError:
+        results.put(('error', f"memory budget of {max_memory_mb} MB exceeded"))
+    except Exception as e:
+        results.put(('error', str(e)))
+
+
+def _stop(process):
+    if not process.is_alive():
+        return
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.terminate()
+    except (ProcessLookupError, PermissionError):
+        process.terminate()
+    process.join(1)
+
+
+def _run_worker(file_content, file_type, budget, light, timeout, info):
+    """Yield pages from one worker process until it finishes or runs out of time.
+
+    Sets ``info['outcome']`` to 'done', 'timeout' or 'error' and collects
+    errors and the probe into ``info``.
+    """
+    context = multiprocessing.get_context(os.getenv("RESUME_EXTRACT_START_METHOD", "spawn"))
+    results = context.Queue()
+    process = context.Process(
+        target=_worker_main,
+        args=(file_content, file_type, budget.max_pages, budget.max_memory_mb, light, results),
+        daemon=False
+    )
+    process.start()
+    deadline = time.monotonic() + timeout
+    info['outcome'] = 'timeout'
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                info['errors'].append(f"wall-clock budget of {timeout:.0f}s exceeded")
+                break
+            try:
+                message = results.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                if not process.is_alive() and results.empty():
+                    info['outcome'] = 'error'
+                    info['errors'].append(f"extraction worker exited with code {process.exitcode}")
+                    break
+                continue
+            kind = message[0]
+            if kind == 'page':
+                yield message[1], message[2], message[3]
+            elif kind == 'probe':
+                info['probe'] = message[1]
+            elif kind == 'done':
+                info['errors'].extend(message[1])
+                info['outcome'] = 'done'
+                break
+            elif kind == 'error':
+                info['errors'].append(message[1])
+                info['outcome'] = 'error'
+                break
+    finally:
+        _stop(process)
+        process.join(1)
+
+
+def iter_isolated_pages(file_content, file_type, budget=None, errors=None, progress=None, info=None):
+    """Yield ``(page_number, text, backend)`` from an isolated, budgeted worker.
+
+    When the full extraction runs out of time or memory before producing
+    anything, a light PyPDF2-only worker gets ``budget.fallback_seconds`` to
+    salvage the text layer. ``info`` receives the final ``status`` and the
+    ``probe`` the worker ran.
+    """
+    budget = budget or ExtractionBudget.from_env()
+    errors = [] if errors is None else errors
+    info = {} if info is None else info
+    info.update({'errors': errors, 'probe': None})
+    done = 0
+
+    def report(page):
+        nonlocal done
+        done += 1
+        if progress:
+            total = (info['probe'] or {}).get('page_count') or 0
+            if budget.max_pages:
+                total = min(total, budget.max_pages)
+            progress(done, max(total, done))
+        return page
+
+    for page in _run_worker(file_content, file_type, budget, False, budget.wall_seconds, info):
+        yield report(page)
+
+    if info['outcome'] == 'done':
+        page_count = (info['probe'] or {}).get('page_count') or 0
+        truncated = budget.max_pages and page_count > budget.max_pages
+        if truncated:
+            errors.append(f"page budget of {budget.max_pages} reached; {page_count - budget.max_pages} pages skipped")
+        info['status'] = STATUS_TRUNCATED if truncated else STATUS_OK
+        return
+    if done:
+        info['status'] = STATUS_PARTIAL
+        return
+
+    fallback_info = {'errors': [], 'probe': None}
+    for page in _run_worker(file_content, file_type, budget, True, budget.fallback_seconds, fallback_info):
+        yield report(page)
+    errors.extend(f"fallback: {error}" for error in fallback_info['errors'])
+    if done:
+        info['status'] = STATUS_FALLBACK
+    else:
+        info['status'] = STATUS_TIMEOUT if info['outcome'] == 'timeout' else STATUS_FAILED
@@ -0,0 +1,100 @@
+"""
+Aho-Corasick keyword automaton.
+
+All keywords are compiled into a single trie with failure links, so one
+scan over the text reports every occurrence of every keyword, overlapping
+ones included, in time linear in the text no matter how many keywords
+there are. Each keyword carries a set of tags saying what it stands for
+(a document type, a section, a skill...), so one shared automaton can
+serve several kinds of lookups.
+
+Matching is case-insensitive: keywords are lowercased when added and
+``scan`` lowercases the text.
+"""
+from collections import deque
+
+
+class KeywordAutomaton:
+    def __init__(self, keywords=None):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        # Keyword ending exactly at each node, if any
+        self._terminal = [None]
+        # Keyword -> set of tags attached to it
+        self.tags = {}
+        self._built = False
+        for keyword in keywords or ():
+            self.add(keyword)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __contains__(self, keyword):
+        return keyword.lower() in self.tags
+
+    def add(self, keyword, tag=None):
+        """Add a keyword, optionally tagging it; adding it again only adds the tag"""
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        if keyword not in self.tags:
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._terminal.append(None)
+                node = next_node
+            self._terminal[node] = keyword
+            self.tags[keyword] = set()
+            self._built = False
+        if tag is not None:
+            self.tags[keyword].add(tag)
+
+    def build(self):
+        """Compute failure links; called automatically before the first scan"""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque()
+        for node in goto[0].values():
+            fail[node] = 0
+            out[node] = (self._terminal[node],) if self._terminal[node] else ()
+            queue.append(node)
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                # Keywords that end here include those ending at the failure state
+                own = self._terminal[child]
+                out[child] = ((own,) if own else ()) + out[fail[child]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text):
+        """Yield ``(start, keyword)`` for every occurrence in already-lowercased text"""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword in out[node]:
+                yield index - len(keyword) + 1, keyword
+
+    def scan(self, text):
+        """All ``(start, keyword)`` hits in ``text`` from one pass, ordered by end position"""
+        return list(self.iter_matches(text.lower()))
+
+    def found(self, text):
+        """Set of keywords that occur anywhere in ``text``"""
+        return {keyword for _, keyword in self.scan(text)}
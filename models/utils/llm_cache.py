@@ -0,0 +1,146 @@
+"""
+Persistent cache of LLM responses.
+
+Responses are keyed by a hash of the model name, the final prompt and the
+generation config, so the same resume analyzed for the same role again is
+answered from SQLite in milliseconds instead of spending API quota. Each
+row holds the raw response text next to the score fields parsed from it.
+Entries expire after a TTL, and once the stored text grows past a size
+cap the least recently used entries are evicted. A database that cannot
+be created or opened disables the cache instead of failing the analyzer.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = os.getenv(
+    "RESUME_LLM_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "llm_responses.db")
+)
+DEFAULT_TTL_SECONDS = int(os.getenv("RESUME_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+DEFAULT_MAX_BYTES = int(os.getenv("RESUME_LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def response_key(model_name, prompt, generation_config=None):
+    """Cache key for one request: a hash of the model, the final prompt and the generation config"""
+    request = json.dumps([model_name, prompt, generation_config or {}], sort_keys=True, default=str)
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, db_path=DEFAULT_DB_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._execute('''
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                resume_score INTEGER,
+                ats_score INTEGER,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            ''')
+            self._execute('CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used)')
+        except (OSError, sqlite3.Error) as e:
+            # A read-only or locked location disables the cache; every request goes to the API
+            print(f"LLM response cache disabled: {e}")
+            self.db_path = None
+
+    def _execute(self, query, params=()):
+        return self._transaction((query, params))
+
+    def _transaction(self, *statements):
+        """Run ``(query, params)`` statements in one transaction; returns the last one's first row"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            row = None
+            for query, params in statements:
+                row = conn.execute(query, params).fetchone()
+            conn.commit()
+            return row
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """Return ``{"analysis", "resume_score", "ats_score", "model"}`` for a cached response, or None"""
+        if not self.db_path:
+            return None
+        now = time.time()
+        try:
+            row = self._transaction(
+                ('UPDATE llm_responses SET last_used = ? WHERE key = ? AND created_at >= ?',
+                 (now, key, now - self.ttl_seconds)),
+                ('SELECT model, response, resume_score, ats_score, created_at FROM llm_responses WHERE key = ?',
+                 (key,))
+            )
+        except sqlite3.Error as e:
+            print(f"Could not read cached LLM response: {e}")
+            return None
+
+        with self._lock:
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            if row[4] < now - self.ttl_seconds:
+                self.stats['expired'] += 1
+                return None
+            self.stats['hits'] += 1
+        model, response, resume_score, ats_score, _ = row
+        return {"analysis": response, "resume_score": resume_score, "ats_score": ats_score, "model": model}
+
+    def set(self, key, model_name, analysis, resume_score=None, ats_score=None):
+        """Store a response with its parsed scores, then drop expired and least recently used entries"""
+        if not self.db_path:
+            return
+        now = time.time()
+        try:
+            self._transaction(
+                ('INSERT OR REPLACE INTO llm_responses '
+                 '(key, model, response, resume_score, ats_score, size, created_at, last_used) '
+                 'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                 (key, model_name, analysis, resume_score, ats_score, len(analysis.encode('utf-8')), now, now)),
+                ('DELETE FROM llm_responses WHERE created_at < ?', (now - self.ttl_seconds,)),
+                # Keep the most recently used entries that fit in max_bytes together
+                ('DELETE FROM llm_responses WHERE key IN ('
+                 'SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS kept '
+                 'FROM llm_responses) WHERE kept > ?)',
+                 (self.max_bytes,))
+            )
+        except sqlite3.Error as e:
+            print(f"Could not persist LLM response: {e}")
+
+    def size(self):
+        """Number of stored responses and their total size in bytes"""
+        if not self.db_path:
+            return 0, 0
+        count, total = self._execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses')
+        return count, total
+
+    def clear(self):
+        if self.db_path:
+            self._execute('DELETE FROM llm_responses')
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Process-wide cache at RESUME_LLM_CACHE_DB, or None when it is set empty or unusable"""
+    global _shared_cache
+    if _shared_cache is None and DEFAULT_DB_PATH:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = LLMResponseCache(DEFAULT_DB_PATH)
+    return _shared_cache if _shared_cache is not None and _shared_cache.db_path else None
@@ -0,0 +1,95 @@
+"""
+Page-at-a-time OCR for scanned PDFs.
+
+Each worker rasterizes a single page and runs Tesseract on it, so only one
+page image per worker is ever alive no matter how long the document is.
+Pages are fanned out to a process pool and yielded back in page order.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+OCR_WORKERS = int(os.getenv("RESUME_OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_DPI = int(os.getenv("RESUME_OCR_DPI", "200"))
+
+
+def pdf_page_count(pdf_bytes, poppler_path=None):
+    """Number of pages in a PDF, read from Poppler's pdfinfo"""
+    from pdf2image import pdfinfo_from_bytes
+
+    return int(pdfinfo_from_bytes(pdf_bytes, poppler_path=poppler_path)["Pages"])
+
+
+def _ocr_page_bytes(pdf_bytes, page_number, dpi, poppler_path):
+    import pytesseract
+    from pdf2image import convert_from_bytes
+
+    images = convert_from_bytes(
+        pdf_bytes, dpi=dpi, first_page=page_number, last_page=page_number,
+        poppler_path=poppler_path
+    )
+    try:
+        return "".join(pytesseract.image_to_string(image) for image in images)
+    finally:
+        for image in images:
+            image.close()
+
+
+# The document a pool worker is OCRing, handed over once by the initializer
+_worker_pdf_bytes = None
+
+
+def _init_worker(pdf_bytes):
+    global _worker_pdf_bytes
+    _worker_pdf_bytes = pdf_bytes
+
+
+def _ocr_page(task):
+    """Rasterize one page and OCR it; runs inside a pool worker"""
+    page_number, dpi, poppler_path = task
+    return _ocr_page_bytes(_worker_pdf_bytes, page_number, dpi, poppler_path)
+
+
+def iter_ocr_pages(pdf_bytes, page_numbers=None, workers=None, dpi=OCR_DPI, poppler_path=None):
+    """Yield ``(page_number, text)`` for each page of a PDF in page order.
+
+    ``pdf_bytes`` is the document held in memory; each worker receives it
+    once when it starts rather than once per page. ``page_numbers``
+    restricts OCR to specific 1-based pages. At most ``2 * workers`` pages
+    are in flight at once, which keeps both page images and
+    finished-but-unconsumed results bounded. ``workers`` defaults to the
+    module-level ``OCR_WORKERS``.
+    """
+    if workers is None:
+        workers = OCR_WORKERS
+    pdf_bytes = bytes(pdf_bytes)
+    if page_numbers is None:
+        page_numbers = range(1, pdf_page_count(pdf_bytes, poppler_path) + 1)
+    tasks = [(page_number, dpi, poppler_path) for page_number in page_numbers]
+
+    if workers <= 1 or len(tasks) <= 1:
+        for page_number, dpi, poppler_path in tasks:
+            yield page_number, _ocr_page_bytes(pdf_bytes, page_number, dpi, poppler_path)
+        return
+
+    window = 2 * workers
+    task_iter = iter(tasks)
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+                             initargs=(pdf_bytes,)) as pool:
+        pending = deque()
+        for task in task_iter:
+            pending.append((task[0], pool.submit(_ocr_page, task)))
+            if len(pending) >= window:
+                break
+        while pending:
+            page_number, future = pending.popleft()
+            text = future.result()
+            task = next(task_iter, None)
+            if task is not None:
+                pending.append((task[0], pool.submit(_ocr_page, task)))
+            yield page_number, text
+
+
+def ocr_pdf(pdf_bytes, page_numbers=None, workers=None, dpi=OCR_DPI, poppler_path=None):
+    """OCR a PDF and return the page texts in page order"""
+    return [text for _, text in iter_ocr_pages(pdf_bytes, page_numbers, workers, dpi, poppler_path)]
@@ -0,0 +1,118 @@
+"""
+Cheap structural probe for uploaded PDFs.
+
+Looks only at the PDF object structure (page tree, resources, raw content
+streams and the encryption dictionary), never at layout, and decides up
+front which extraction backend is the cheapest one that will work:
+
+- ``pypdf2``     every page has fonts and text operators, so the plain
+                 PyPDF2 reader is enough and pdfplumber's layout analysis
+                 can be skipped
+- ``ocr``        every page is image-only, or the file cannot be decrypted,
+                 so text readers would only waste time
+- ``hybrid``     a mix: text pages go to a text reader, image-only pages
+                 straight to OCR
+- ``pdfplumber`` anything the probe cannot classify confidently
+"""
+import io
+import re
+import time
+
+# Text-showing operators inside a BT ... ET block
+TEXT_OPERATOR_PATTERN = re.compile(rb"\bT[jJ]\b")
+
+
+def _resolve(obj):
+    return obj.get_object() if hasattr(obj, 'get_object') else obj
+
+
+def _content_data(page):
+    contents = _resolve(page.get('/Contents'))
+    if contents is None:
+        return b""
+    if isinstance(contents, list):
+        return b"\n".join(_resolve(part).get_data() for part in contents)
+    return contents.get_data()
+
+
+def classify_page(page):
+    """Classify a PyPDF2 page as 'text', 'image', 'empty' or 'unknown'"""
+    resources = _resolve(page.get('/Resources')) or {}
+    fonts = _resolve(resources.get('/Font')) or {}
+    xobjects = _resolve(resources.get('/XObject')) or {}
+
+    has_images = False
+    has_forms = False
+    for name in xobjects:
+        subtype = _resolve(xobjects[name]).get('/Subtype')
+        if subtype == '/Image':
+            has_images = True
+        elif subtype == '/Form':
+            has_forms = True
+
+    if fonts:
+        data = _content_data(page)
+        if b"BT" in data and TEXT_OPERATOR_PATTERN.search(data):
+            return 'text'
+    if has_forms:
+        # Text may be hidden inside a form XObject; let a text reader decide
+        return 'unknown'
+    if has_images:
+        return 'image'
+    return 'empty' if not fonts else 'unknown'
+
+
+def probe_pdf(file_content):
+    """Inspect a PDF's structure and pick the cheapest backend that will work.
+
+    Returns a dict with the page count, encryption state, per-class page
+    lists, the chosen ``backend``, the ``text_reader`` to use for pages with a
+    text layer and the probe's own ``elapsed`` time.
+    """
+    import PyPDF2
+
+    start = time.perf_counter()
+    reader = PyPDF2.PdfReader(io.BytesIO(file_content), strict=False)
+    probe = {
+        'page_count': 0,
+        'encrypted': bool(reader.is_encrypted),
+        'text_pages': [],
+        'image_pages': [],
+        'other_pages': [],
+        'backend': 'pdfplumber',
+        'text_reader': 'pdfplumber'
+    }
+
+    if reader.is_encrypted:
+        try:
+            decrypted = reader.decrypt("")
+        except Exception:
+            decrypted = 0
+        if not decrypted:
+            probe['backend'] = 'ocr'
+            probe['elapsed'] = time.perf_counter() - start
+            return probe
+
+    probe['page_count'] = len(reader.pages)
+    for index, page in enumerate(reader.pages):
+        try:
+            kind = classify_page(page)
+        except Exception:
+            kind = 'unknown'
+        if kind == 'text':
+            probe['text_pages'].append(index + 1)
+        elif kind == 'image':
+            probe['image_pages'].append(index + 1)
+        else:
+            probe['other_pages'].append(index + 1)
+
+    if not probe['other_pages'] and probe['text_pages']:
+        probe['text_reader'] = 'pypdf2'
+    if probe['page_count'] and len(probe['image_pages']) == probe['page_count']:
+        probe['backend'] = 'ocr'
+    elif probe['image_pages']:
+        probe['backend'] = 'hybrid'
+    elif probe['text_reader'] == 'pypdf2':
+        probe['backend'] = 'pypdf2'
+    probe['elapsed'] = time.perf_counter() - start
+    return probe
@@ -1,7 +1,47 @@
+import copy
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .analysis_cache import analysis_key, normalize_text
+from .docx_reader import docx_text
+from .extraction_cache import get_extraction_cache, read_upload_bytes
+from .keyword_automaton import KeywordAutomaton
+from .resume_index import ResumeIndex
+from .resume_sections import SectionRules
+from .stage_profiler import NULL_TIMER
+
+
+# Analyzer and role requirements a pool worker reuses for every batch it gets
+_worker_analyzer = None
+_worker_requirements = None
+
+
+def _init_analyze_worker(job_requirements):
+    global _worker_analyzer, _worker_requirements
+    _worker_analyzer = ResumeAnalyzer()
+    _worker_requirements = job_requirements
+
+
+def _analyze_batch(texts):
+    """Analyze a batch of texts; runs inside a pool worker"""
+    return [_worker_analyzer.analyze_resume({'raw_text': text}, _worker_requirements) for text in texts]
+
 
 class ResumeAnalyzer:
-    def __init__(self):
+    # Keyword automaton and section rules, compiled by the first instance and shared
+    _shared_rules = None
+
+    def __init__(self, analysis_cache=None, profiler=None, section_results=None):
+        # Optional AnalysisCache that memoizes analyze_resume
+        self.analysis_cache = analysis_cache
+        # Optional StageProfiler; when set, each analysis carries '_timings' per stage
+        self.profiler = profiler
+        # Section name -> (fingerprint, result) of the last analysis. Pass a dict that
+        # outlives this analyzer (e.g. from st.session_state) to keep it across reruns
+        self._section_results = {} if section_results is None else section_results
+
         # Document type indicators
         self.document_types = {
             'resume': [
@@ -21,16 +61,111 @@ class ResumeAnalyzer:
                 'date of issue', 'identification'
             ]
         }
+
+        # Keywords that open each resume section
+        self.section_keywords = {
+            'education': [
+                'education', 'academic', 'qualification', 'degree', 'university', 'college',
+                'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
+                'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc','bca', 'mca', 'b.com',
+                'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
+            ],
+            'experience': [
+                'experience', 'employment', 'work history', 'professional experience',
+                'work experience', 'career history', 'professional background',
+                'employment history', 'job history', 'positions held',
+                'job title', 'job responsibilities', 'job description', 'job summary'
+            ],
+            'projects': [
+                'projects', 'personal projects', 'academic projects', 'key projects',
+                'major projects', 'professional projects', 'project experience',
+                'relevant projects', 'featured projects','latest projects',
+                'top projects'
+            ],
+            'skills': [
+                'skills', 'technical skills', 'competencies', 'expertise',
+                'core competencies', 'professional skills', 'key skills',
+                'technical expertise', 'proficiencies', 'qualifications',
+                'top skills', 'key skill', 'major skill', 'personal skill',
+                'soft skills', 'soft skill', 'soft skillset'
+            ],
+            'summary': [
+                'summary', 'professional summary', 'career summary', 'objective',
+                'career objective', 'professional objective', 'about me', 'profile',
+                'professional profile', 'career profile', 'overview', 'skill summary'
+            ]
+        }
+
+        # Sections every resume should have, scored by check_resume_sections
+        self.essential_sections = {
+            'contact': ['email', 'phone', 'address', 'linkedin'],
+            'education': ['education', 'university', 'college', 'degree', 'academic'],
+            'experience': ['experience', 'work', 'employment', 'job', 'internship'],
+            'skills': ['skills', 'technologies', 'tools', 'proficiencies', 'expertise']
+        }
+
+        # Every keyword list above is compiled into one automaton, once per process
+        if ResumeAnalyzer._shared_rules is None:
+            ResumeAnalyzer._shared_rules = self._build_section_rules()
+        self.section_rules = ResumeAnalyzer._shared_rules
+        self.keyword_automaton = self.section_rules.automaton
+        self._sections = None
+        self._resume_index = None
+        self._skill_hits = None
+        # Sections recomputed by the last analyze_resume call
+        self.last_rescored = []
+
+    def _build_section_rules(self):
+        """Compile every keyword list the analyzer matches into one automaton"""
+        automaton = KeywordAutomaton()
+        for doc_type, keywords in self.document_types.items():
+            for keyword in keywords:
+                automaton.add(keyword, ('document_type', doc_type))
+        for section, keywords in self.essential_sections.items():
+            for keyword in keywords:
+                automaton.add(keyword, ('essential', section))
+        # Any resume keyword marks the start of another section
+        rules = SectionRules(self.section_keywords, self.document_types['resume'], automaton)
+        automaton.build()
+        return rules
+
+    def get_keyword_hits(self, text):
+        """Keywords the automaton finds anywhere in the text"""
+        return self.get_sections(text).keywords
         
+    def get_resume_index(self, text):
+        """Token/phrase index of the text, reused for the same text across roles"""
+        if self._resume_index is None or self._resume_index[0] != text:
+            self._resume_index = (text, ResumeIndex(text))
+        return self._resume_index[1]
+
+    def get_skill_hits(self, text, skills=()):
+        """Canonical IDs of the skills the text mentions, allowing for variants and typos.
+
+        Covers every skill SkillCanon knows plus any of ``skills`` it does not.
+        """
+        from .skill_canon import CANON
+        from .skill_matcher import SKILL_MATCHER, extra_matcher
+        index = self.get_resume_index(text)
+        if self._skill_hits is None or self._skill_hits[0] != text:
+            self._skill_hits = (text, SKILL_MATCHER.hits(index))
+        hits = self._skill_hits[1]
+        extra = frozenset(skill for skill in skills
+                          if not all(skill_id in CANON for skill_id in CANON.canonicalize(skill)))
+        if extra:
+            hits = hits | extra_matcher(extra).hits(index)
+        return hits
+
     def detect_document_type(self, text):
-        text = text.lower()
+        found = self.get_keyword_hits(text)
+        word_count = len(text.split())
         scores = {}
         
         # Calculate score for each document type
         for doc_type, keywords in self.document_types.items():
-            matches = sum(1 for keyword in keywords if keyword in text)
+            matches = sum(1 for keyword in keywords if keyword in found)
             density = matches / len(keywords)
-            frequency = matches / (len(text.split()) + 1)  # Add 1 to avoid division by zero
+            frequency = matches / (word_count + 1)  # Add 1 to avoid division by zero
             scores[doc_type] = (density * 0.7) + (frequency * 0.3)
         
         # Get the highest scoring document type
@@ -40,20 +175,15 @@ class ResumeAnalyzer:
         return best_match[0] if best_match[1] > 0.15 else 'unknown'
         
     def calculate_keyword_match(self, resume_text, required_skills):
-        resume_text = resume_text.lower()
+        # Skills are compared by canonical ID, so "JS" or "ReactJS" in the resume meet
+        # "JavaScript" or "React", and "React/Angular/Vue" is met by any one of them
+        from .skill_canon import CANON
+        skill_hits = self.get_skill_hits(resume_text, required_skills)
         found_skills = []
         missing_skills = []
-        
         for skill in required_skills:
-            skill_lower = skill.lower()
-            # Check for exact match
-            if skill_lower in resume_text:
-                found_skills.append(skill)
-            # Check for partial matches (e.g., "Python" in "Python programming")
-            elif any(skill_lower in phrase for phrase in resume_text.split('.')):
-                found_skills.append(skill)
-            else:
-                missing_skills.append(skill)
+            found = any(skill_id in skill_hits for skill_id in CANON.canonicalize(skill))
+            (found_skills if found else missing_skills).append(skill)
                 
         match_score = (len(found_skills) / len(required_skills)) * 100 if required_skills else 0
         
@@ -63,18 +193,17 @@ class ResumeAnalyzer:
             'missing_skills': missing_skills
         }
         
+    def rank_roles(self, text, top=5):
+        """Best-fit JOB_ROLES roles for the text, scored against all roles at once"""
+        from .role_matcher import ROLE_MATRIX
+        return ROLE_MATRIX.rank(self.get_skill_hits(text), top)
+
     def check_resume_sections(self, text):
-        text = text.lower()
-        essential_sections = {
-            'contact': ['email', 'phone', 'address', 'linkedin'],
-            'education': ['education', 'university', 'college', 'degree', 'academic'],
-            'experience': ['experience', 'work', 'employment', 'job', 'internship'],
-            'skills': ['skills', 'technologies', 'tools', 'proficiencies', 'expertise']
-        }
-        
+        keywords_found = self.get_keyword_hits(text)
+
         section_scores = {}
-        for section, keywords in essential_sections.items():
-            found = sum(1 for keyword in keywords if keyword in text)
+        for section, keywords in self.essential_sections.items():
+            found = sum(1 for keyword in keywords if keyword in keywords_found)
             section_scores[section] = min(25, (found / len(keywords)) * 25)
             
         return sum(section_scores.values())
@@ -119,43 +248,42 @@ class ResumeAnalyzer:
         
     def extract_text_from_pdf(self, file):
         try:
-            import PyPDF2
-            import io
-            
-            # Create a PDF reader object
             # First make sure we have the file content as bytes
-            if hasattr(file, 'read'):
-                # If it's already a file-like object, read it
-                file_content = file.read()
-                file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                file_content = file
-                
-            # Create BytesIO from bytes content
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            
-            # Extract text from all pages
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-                
-            return text
+            file_content = read_upload_bytes(file)
+            return get_extraction_cache().get_or_extract(
+                'analyzer-pdf', file_content, lambda: self._extract_pdf_text(file_content)
+            )
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+    def _extract_pdf_text(self, file_content):
+        import PyPDF2
+        import io
+
+        # Create BytesIO from bytes content
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+
+        # Extract text from all pages
+        text = ""
+        for page in pdf_reader.pages:
+            text += page.extract_text() + "\n"
+
+        return text
             
     def extract_text_from_docx(self, docx_file):
         """Extract text from a DOCX file"""
         try:
-            from docx import Document
-            doc = Document(docx_file)
-            full_text = []
-            for paragraph in doc.paragraphs:
-                full_text.append(paragraph.text)
-            return '\n'.join(full_text)
+            file_content = read_upload_bytes(docx_file)
+            return get_extraction_cache().get_or_extract(
+                'analyzer-docx', file_content, lambda: self._extract_docx_text(file_content)
+            )
         except Exception as e:
             raise Exception(f"Error extracting text from DOCX file: {str(e)}")
 
+    def _extract_docx_text(self, file_content):
+        # Streams the XML so table cells, text boxes and headers are included
+        return docx_text(file_content)
+
     def extract_personal_info(self, text):
         """Extract personal information from resume text"""
         # Basic patterns for personal info
@@ -182,276 +310,249 @@ class ResumeAnalyzer:
             'portfolio': ''  # Can be enhanced later
         }
 
+    def get_sections(self, text):
+        """Segment the text into sections, reusing the map for the same text"""
+        if self._sections is None or self._sections[0] != text:
+            self._sections = (text, self.section_rules.segment(text))
+        return self._sections[1]
+
     def extract_education(self, text):
         """Extract education information from resume text"""
-        education = []
-        lines = text.split('\n')
-        education_keywords = [
-            'education', 'academic', 'qualification', 'degree', 'university', 'college',
-            'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
-            'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc','bca', 'mca', 'b.com',
-            'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
-        ]
-        in_education_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in education_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in education_keywords):
-                    # This line contains education info, not just a header
-                    current_entry.append(line)
-                in_education_section = True
-                continue
-            
-            if in_education_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(edu_key.lower() in line.lower() for edu_key in education_keywords):
-                        in_education_section = False
-                        if current_entry:
-                            education.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    education.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            education.append(' '.join(current_entry))
-        
-        return education
+        return list(self.get_sections(text).entries['education'])
 
     def extract_experience(self, text):
         """Extract work experience information from resume text"""
-        experience = []
-        lines = text.split('\n')
-        experience_keywords = [
-            'experience', 'employment', 'work history', 'professional experience',
-            'work experience', 'career history', 'professional background',
-            'employment history', 'job history', 'positions held', 'experience',
-            'job title', 'job responsibilities', 'job description', 'job summary'
-        ]
-        in_experience_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in experience_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in experience_keywords):
-                    # This line contains experience info, not just a header
-                    current_entry.append(line)
-                in_experience_section = True
-                continue
-            
-            if in_experience_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(exp_key.lower() in line.lower() for exp_key in experience_keywords):
-                        in_experience_section = False
-                        if current_entry:
-                            experience.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    experience.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            experience.append(' '.join(current_entry))
-        
-        return experience
+        return list(self.get_sections(text).entries['experience'])
 
     def extract_projects(self, text):
         """Extract project information from resume text"""
-        projects = []
-        lines = text.split('\n')
-        project_keywords = [
-            'projects', 'personal projects', 'academic projects', 'key projects',
-            'major projects', 'professional projects', 'project experience',
-            'relevant projects', 'featured projects','latest projects',
-            'top projects'
-        ]
-        in_project_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in project_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in project_keywords):
-                    # This line contains project info, not just a header
-                    current_entry.append(line)
-                in_project_section = True
-                continue
-            
-            if in_project_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(proj_key.lower() in line.lower() for proj_key in project_keywords):
-                        in_project_section = False
-                        if current_entry:
-                            projects.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    projects.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            projects.append(' '.join(current_entry))
-        
-        return projects
+        return list(self.get_sections(text).entries['projects'])
 
     def extract_skills(self, text):
         """Extract skills from resume text"""
+        from .skill_canon import CANON
+        from .skill_matcher import SKILL_MATCHER
         skills = set()  # Use set to avoid duplicates
-        lines = text.split('\n')
-        skills_keywords = [
-            'skills', 'technical skills', 'competencies', 'expertise',
-            'core competencies', 'professional skills', 'key skills',
-            'technical expertise', 'proficiencies', 'qualifications',
-            'top skills', 'key skill', 'major skill', 'personal skill',
-            'soft skills', 'soft skill', 'soft skillset'
-        ]
-        in_skills_section = False
-        current_entry = []
 
         # Common skill separators
         separators = [',', '•', '|', '/', '\\', '·', '>', '-', '–', '―']
 
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in skills_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in skills_keywords):
-                    # This line contains skills, not just a header
-                    current_entry.append(line)
-                in_skills_section = True
-                continue
-            
-            if in_skills_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(skill_key.lower() in line.lower() for skill_key in skills_keywords):
-                        in_skills_section = False
-                        if current_entry:
-                            # Process the current entry
-                            text_to_process = ' '.join(current_entry)
-                            # Split by common separators
-                            for separator in separators:
-                                if separator in text_to_process:
-                                    skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    # Process the current entry
-                    text_to_process = ' '.join(current_entry)
-                    # Split by common separators
-                    for separator in separators:
-                        if separator in text_to_process:
-                            skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                    current_entry = []
-        
-        if current_entry:
-            # Process any remaining skills
-            text_to_process = ' '.join(current_entry)
+        for text_to_process in self.get_sections(text).entries['skills']:
+            # Split by common separators
             for separator in separators:
                 if separator in text_to_process:
                     skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-        
-        return list(skills)
+
+        # Known skills are reported once, under their canonical name, so "ReactJS"
+        # and "React.js" both become "React"
+        named = {}
+        for skill in skills:
+            skill_ids = SKILL_MATCHER.match(skill)
+            if skill_ids:
+                skill_id = min(skill_ids)
+                named.setdefault(skill_id, CANON.name(skill_id))
+            else:
+                named.setdefault(skill, skill)
+
+        return list(named.values())
 
     def extract_summary(self, text):
         """Extract summary/objective from resume text"""
+        sections = self.get_sections(text)
         summary = []
-        lines = text.split('\n')
-        summary_keywords = [
-            'summary', 'professional summary', 'career summary', 'objective',
-            'career objective', 'professional objective', 'about me', 'profile',
-            'professional profile', 'career profile', 'overview', 'skill summary'
-        ]
-        in_summary_section = False
-        current_entry = []
-
-        # Try to find summary at the beginning of the resume
-        start_index = 0
-        while start_index < min(10, len(lines)) and not lines[start_index].strip():
-            start_index += 1
-
-        # Check first few non-empty lines for potential summary
-        first_lines = []
-        lines_checked = 0
-        for line in lines[start_index:]:
-            if line.strip():
-                first_lines.append(line.strip())
-                lines_checked += 1
-                if lines_checked >= 5:  # Check first 5 non-empty lines
-                    break
 
         # If first few lines look like a summary (no special formatting, no contact info)
-        if first_lines and not any(keyword in first_lines[0].lower() for keyword in summary_keywords):
+        first_lines = sections.first_lines
+        if first_lines:
+            first_line_sections, _ = self.section_rules.classify(self.keyword_automaton.found(first_lines[0]))
+        if first_lines and 'summary' not in first_line_sections:
             potential_summary = ' '.join(first_lines)
             if len(potential_summary.split()) > 10:  # More than 10 words
                 if not re.search(r'\b(?:email|phone|address|tel|mobile|linkedin)\b', potential_summary.lower()):
                     summary.append(potential_summary)
 
-        # Look for explicitly marked summary section
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in summary_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in summary_keywords):
-                    # This line contains summary info, not just a header
-                    current_entry.append(line)
-                in_summary_section = True
-                continue
-            
-            if in_summary_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(sum_key.lower() in line.lower() for sum_key in summary_keywords):
-                        in_summary_section = False
-                        if current_entry:
-                            summary.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    summary.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            summary.append(' '.join(current_entry))
-        
+        # Explicitly marked summary section
+        summary.extend(sections.entries['summary'])
+
         return ' '.join(summary) if summary else ''
 
+    def analyze_many(self, texts, job_requirements, workers=None, batch_size=16):
+        """Analyze many resume texts against one role, yielding results in input order.
+
+        ``texts`` may be any iterable, including a generator over a large
+        dump; it is consumed as results are produced. Batches of
+        ``batch_size`` texts are spread over ``workers`` processes (all
+        cores by default), each of which compiles its matchers once.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            for text in texts:
+                yield self.analyze_resume({'raw_text': text}, job_requirements)
+            return
+
+        def batches():
+            batch = []
+            for text in texts:
+                batch.append(text)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        batch_iter = batches()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_analyze_worker,
+                                 initargs=(job_requirements,)) as pool:
+            pending = deque()
+            for batch in batch_iter:
+                pending.append(pool.submit(_analyze_batch, batch))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                results = pending.popleft().result()
+                batch = next(batch_iter, None)
+                if batch is not None:
+                    pending.append(pool.submit(_analyze_batch, batch))
+                yield from results
+
     def analyze_resume(self, resume_data, job_requirements):
         """Analyze resume and return scores and recommendations"""
+        timer = self.profiler.start() if self.profiler else NULL_TIMER
+        cache_status = 'off'
+        if self.analysis_cache is None:
+            analysis = self._analyze_resume(resume_data, job_requirements, timer)
+        else:
+            with timer.stage('cache_lookup'):
+                text = normalize_text(resume_data.get('raw_text', ''))
+                key = analysis_key(text, job_requirements)
+                analysis = self.analysis_cache.get(key)
+            cache_status = 'hit' if analysis is not None else 'miss'
+            if analysis is None:
+                analysis = self._analyze_resume(dict(resume_data, raw_text=text), job_requirements, timer)
+                # Failures are not remembered so a retry analyzes again
+                if 'error' not in analysis:
+                    self.analysis_cache.set(key, analysis)
+
+        if self.profiler:
+            # Added after caching so a memoized result never carries stale timings
+            analysis['_timings'] = timer.finish()
+            self.profiler.emit(analysis['_timings'], {
+                'document_type': analysis.get('document_type'),
+                'cache': cache_status
+            })
+        return analysis
+
+    def _rescore(self, section, fingerprint, compute, *args):
+        """``compute(*args)`` for one section, reused while its fingerprint is unchanged.
+
+        Only the latest result per section is kept, which is what an editing
+        loop needs; the app keeps them in the session, as it rebuilds the
+        analyzer on every Streamlit rerun. This covers the skills-section normalization and the
+        formatting and suggestion sub-scores. Work that reads the whole text
+        (segmentation, keyword and skill matching) is not keyed here; it is
+        incremental through the per-line caches of SectionRules, ResumeIndex
+        and the skill matcher, so only edited lines are scanned again.
+        """
+        previous = self._section_results.get(section)
+        if previous is None or previous[0] != fingerprint:
+            previous = (fingerprint, compute(*args))
+            self._section_results[section] = previous
+            self.last_rescored.append(section)
+        return copy.deepcopy(previous[1])
+
+    def _contact_suggestions(self, personal_info):
+        """Suggestions for missing contact details"""
+        contact_suggestions = []
+        if not personal_info.get('email'):
+            contact_suggestions.append("Add your email address")
+        if not personal_info.get('phone'):
+            contact_suggestions.append("Add your phone number")
+        if not personal_info.get('linkedin'):
+            contact_suggestions.append("Add your LinkedIn profile URL")
+
+        return contact_suggestions
+
+    def _summary_suggestions(self, summary):
+        """Suggestions for the professional summary"""
+        summary_suggestions = []
+        if not summary:
+            summary_suggestions.append("Add a professional summary to highlight your key qualifications")
+        elif len(summary.split()) < 30:
+            summary_suggestions.append("Expand your professional summary to better highlight your experience and goals")
+        elif len(summary.split()) > 100:
+            summary_suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
+
+        return summary_suggestions
+
+    def _skills_suggestions(self, skills, keyword_match):
+        """Suggestions for the skills section"""
+        skills_suggestions = []
+        if not skills:
+            skills_suggestions.append("Add a dedicated skills section")
+        if isinstance(skills, (list, set)) and len(list(skills)) < 5:
+            skills_suggestions.append("List more relevant technical and soft skills")
+        if keyword_match['score'] < 70:
+            skills_suggestions.append("Add more skills that match the job requirements")
+
+        return skills_suggestions
+
+    def _experience_suggestions(self, experience):
+        """Suggestions for the work experience entries"""
+        experience_suggestions = []
+        if not experience:
+            experience_suggestions.append("Add your work experience section")
+        else:
+            has_dates = any(re.search(r'\b(19|20)\d{2}\b', exp) for exp in experience)
+            has_bullets = any(re.search(r'[•\-\*]', exp) for exp in experience)
+            has_action_verbs = any(re.search(r'\b(developed|managed|created|implemented|designed|led|improved)\b', 
+                                           exp.lower()) for exp in experience)
+            
+            if not has_dates:
+                experience_suggestions.append("Include dates for each work experience")
+            if not has_bullets:
+                experience_suggestions.append("Use bullet points to list your achievements and responsibilities")
+            if not has_action_verbs:
+                experience_suggestions.append("Start bullet points with strong action verbs")
+
+        return experience_suggestions
+
+    def _education_suggestions(self, education, job_requirements):
+        """Suggestions for the education entries"""
+        education_suggestions = []
+        if not education:
+            education_suggestions.append("Add your educational background")
+        else:
+            has_dates = any(re.search(r'\b(19|20)\d{2}\b', edu) for edu in education)
+            has_degree = any(re.search(r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', 
+                                     edu.lower()) for edu in education)
+            has_gpa = any(re.search(r'\b(gpa|cgpa|grade|percentage)\b', 
+                                  edu.lower()) for edu in education)
+            
+            if not has_dates:
+                education_suggestions.append("Include graduation dates")
+            if not has_degree:
+                education_suggestions.append("Specify your degree type")
+            if not has_gpa and job_requirements.get('require_gpa', False):
+                education_suggestions.append("Include your GPA if it's above 3.0")
+
+        return education_suggestions
+
+    def _analyze_resume(self, resume_data, job_requirements, timer=NULL_TIMER):
+        self.last_rescored = []
         try:
             text = resume_data.get('raw_text', '')
             
             # Extract personal information
-            personal_info = self.extract_personal_info(text)
+            with timer.stage('personal_info'):
+                personal_info = self.extract_personal_info(text)
+            
+            # Split into sections once; everything below reads the section map
+            with timer.stage('segmentation'):
+                self.get_sections(text)
             
             # First detect document type
-            doc_type = self.detect_document_type(text)
+            with timer.stage('document_type'):
+                doc_type = self.detect_document_type(text)
             if doc_type != 'resume':
                 return {
                     'ats_score': 0,
@@ -463,79 +564,50 @@ class ResumeAnalyzer:
                 }
                 
             # Calculate keyword match
-            required_skills = job_requirements.get('required_skills', [])
-            keyword_match = self.calculate_keyword_match(text, required_skills)
+            with timer.stage('keyword_match'):
+                required_skills = job_requirements.get('required_skills', [])
+                keyword_match = self.calculate_keyword_match(text, required_skills)
             
             # Extract all resume sections
-            education = self.extract_education(text)
-            experience = self.extract_experience(text)
-            projects = self.extract_projects(text)
-            skills = list(self.extract_skills(text))  # Convert skills set to list
-            summary = self.extract_summary(text)
+            with timer.stage('section_extraction'):
+                education = self.extract_education(text)
+                experience = self.extract_experience(text)
+                projects = self.extract_projects(text)
+                # Matching each listed skill against the canon only reruns when the skills section changes
+                skills = self._rescore(
+                    'skill_entries', tuple(self.get_sections(text).entries['skills']), self.extract_skills, text
+                )
+                summary = self.extract_summary(text)
             
             # Check resume sections
-            section_score = self.check_resume_sections(text)
+            with timer.stage('section_check'):
+                section_score = self.check_resume_sections(text)
             
             # Check formatting
-            format_score, format_deductions = self.check_formatting(text)
-            
-            # Generate section-specific suggestions
-            contact_suggestions = []
-            if not personal_info.get('email'):
-                contact_suggestions.append("Add your email address")
-            if not personal_info.get('phone'):
-                contact_suggestions.append("Add your phone number")
-            if not personal_info.get('linkedin'):
-                contact_suggestions.append("Add your LinkedIn profile URL")
-            
-            summary_suggestions = []
-            if not summary:
-                summary_suggestions.append("Add a professional summary to highlight your key qualifications")
-            elif len(summary.split()) < 30:
-                summary_suggestions.append("Expand your professional summary to better highlight your experience and goals")
-            elif len(summary.split()) > 100:
-                summary_suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
+            with timer.stage('formatting'):
+                format_score, format_deductions = self._rescore('format', text, self.check_formatting, text)
             
-            skills_suggestions = []
-            if not skills:
-                skills_suggestions.append("Add a dedicated skills section")
-            if isinstance(skills, (list, set)) and len(list(skills)) < 5:
-                skills_suggestions.append("List more relevant technical and soft skills")
-            if keyword_match['score'] < 70:
-                skills_suggestions.append("Add more skills that match the job requirements")
-            
-            experience_suggestions = []
-            if not experience:
-                experience_suggestions.append("Add your work experience section")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', exp) for exp in experience)
-                has_bullets = any(re.search(r'[•\-\*]', exp) for exp in experience)
-                has_action_verbs = any(re.search(r'\b(developed|managed|created|implemented|designed|led|improved)\b', 
-                                               exp.lower()) for exp in experience)
-                
-                if not has_dates:
-                    experience_suggestions.append("Include dates for each work experience")
-                if not has_bullets:
-                    experience_suggestions.append("Use bullet points to list your achievements and responsibilities")
-                if not has_action_verbs:
-                    experience_suggestions.append("Start bullet points with strong action verbs")
-            
-            education_suggestions = []
-            if not education:
-                education_suggestions.append("Add your educational background")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', edu) for edu in education)
-                has_degree = any(re.search(r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', 
-                                         edu.lower()) for edu in education)
-                has_gpa = any(re.search(r'\b(gpa|cgpa|grade|percentage)\b', 
-                                      edu.lower()) for edu in education)
-                
-                if not has_dates:
-                    education_suggestions.append("Include graduation dates")
-                if not has_degree:
-                    education_suggestions.append("Specify your degree type")
-                if not has_gpa and job_requirements.get('require_gpa', False):
-                    education_suggestions.append("Include your GPA if it's above 3.0")
+            # Generate section-specific suggestions. A sub-score whose inputs are the
+            # same as in the previous analysis (only another section was edited)
+            # reuses its previous result; these checks are cheap, the saving on an
+            # edit comes from the per-line caches behind the stages above.
+            with timer.stage('suggestions'):
+                contact_suggestions = self._rescore(
+                    'contact', (personal_info.get('email'), personal_info.get('phone'), personal_info.get('linkedin')),
+                    self._contact_suggestions, personal_info
+                )
+                summary_suggestions = self._rescore('summary', summary, self._summary_suggestions, summary)
+                skills_suggestions = self._rescore(
+                    'skills', (frozenset(skills), keyword_match['score']),
+                    self._skills_suggestions, skills, keyword_match
+                )
+                experience_suggestions = self._rescore(
+                    'experience', tuple(experience), self._experience_suggestions, experience
+                )
+                education_suggestions = self._rescore(
+                    'education', (tuple(education), bool(job_requirements.get('require_gpa', False))),
+                    self._education_suggestions, education, job_requirements
+                )
             
             format_suggestions = []
             if format_score < 100:
@@ -570,6 +642,9 @@ class ResumeAnalyzer:
             if not suggestions:
                 suggestions.append("Your resume is well-optimized for ATS systems")
             
+            with timer.stage('role_ranking'):
+                best_fit_roles = self.rank_roles(text)
+            
             # Return final structured result
             return {
                 **personal_info,  # Include extracted personal info
@@ -583,6 +658,7 @@ class ResumeAnalyzer:
                 'projects': projects,
                 'skills': skills,
                 'summary': summary,
+                'best_fit_roles': best_fit_roles,
                 'suggestions': suggestions,
                 'contact_suggestions': contact_suggestions,
                 'summary_suggestions': summary_suggestions,
@@ -0,0 +1,110 @@
+"""
+Token and phrase index over one resume.
+
+The text is split into sentences and normalized tokens once, and every
+n-gram of up to ``MAX_NGRAM`` tokens is recorded with its line, sentence
+and token position. Looking up a skill is then a dictionary lookup on its
+token tuple, independent of the resume's length, and the same index can
+score the resume against any number of roles.
+
+Tokens keep the characters that matter in technology names (``c++``,
+``c#``), while separators such as spaces, slashes, hyphens, periods and
+bullets are ignored, so "Problem-solving" matches "problem solving",
+"UI/UX" matches "UI / UX" and "React.js" contains "React". Skills are
+tokenized the same way, so "Node.js" is the phrase ``('node', 'js')`` on
+both sides. Phrases never match across a sentence or line break.
+"""
+import re
+from functools import lru_cache
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:'[a-z0-9+#]+)*")
+SENTENCE_PATTERN = re.compile(r"[.!?;]+(?:\s+|$)|\n+")
+MAX_NGRAM = 4
+
+
+def tokenize(text):
+    """Normalized tokens of ``text``"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@lru_cache(maxsize=4096)
+def phrase_key(phrase):
+    """Token tuple a skill or phrase is looked up by; cached across resumes"""
+    return tuple(tokenize(phrase))
+
+
+def compact(key):
+    """Tokens of a key run together, e.g. ('node', 'js') -> 'nodejs'; 'React JS' and 'ReactJS' agree"""
+    return ''.join(key).replace("'", '')
+
+
+@lru_cache(maxsize=4096)
+def skill_form(phrase):
+    """Compact form of a phrase; cached, since the same skills are looked up for every resume"""
+    return compact(phrase_key(phrase))
+
+
+class LineIndex:
+    """Sentences and n-grams of a single line"""
+
+    def __init__(self, line, max_ngram=MAX_NGRAM):
+        # Token list of every sentence in the line
+        self.sentences = []
+        # Token tuple -> list of (sentence index, token index) where it starts
+        self.ngrams = {}
+        for sentence in SENTENCE_PATTERN.split(line):
+            tokens = TOKEN_PATTERN.findall(sentence)
+            if not tokens:
+                continue
+            sentence_index = len(self.sentences)
+            self.sentences.append(tokens)
+            for start in range(len(tokens)):
+                for size in range(1, min(max_ngram, len(tokens) - start) + 1):
+                    key = tuple(tokens[start:start + size])
+                    self.ngrams.setdefault(key, []).append((sentence_index, start))
+        self.keys = frozenset(self.ngrams)
+
+
+@lru_cache(maxsize=8192)
+def line_index(line, max_ngram=MAX_NGRAM):
+    """Index of one lowercased line, shared by every resume containing that line"""
+    return LineIndex(line, max_ngram)
+
+
+class ResumeIndex:
+    """Index of a whole resume, assembled from cached per-line indexes.
+
+    Sentences never span a line break, so a resume's index is just its
+    lines' indexes side by side. Lines that were already indexed, because
+    the resume was analyzed before an edit or shares boilerplate with other
+    resumes, are not tokenized again.
+    """
+
+    def __init__(self, text, max_ngram=MAX_NGRAM):
+        self.max_ngram = max_ngram
+        self.lines = [line_index(line, max_ngram) for line in text.lower().split('\n')]
+        # Every n-gram in the resume
+        self.keys = frozenset().union(*(line.keys for line in self.lines))
+
+    def __contains__(self, phrase):
+        key = phrase_key(phrase) if isinstance(phrase, str) else tuple(phrase)
+        if key and len(key) <= self.max_ngram:
+            return key in self.keys
+        return bool(self.positions(key))
+
+    def positions(self, phrase):
+        """``(line, sentence, token)`` positions where ``phrase`` starts"""
+        key = phrase_key(phrase) if isinstance(phrase, str) else tuple(phrase)
+        if not key:
+            return []
+        head = key[:self.max_ngram]
+        size = len(key)
+        positions = []
+        if head not in self.keys:
+            return []
+        for number, line in enumerate(self.lines):
+            for sentence, start in line.ngrams.get(head, ()):
+                # Longer phrases are checked from the positions of their first n-gram
+                if size <= self.max_ngram or tuple(line.sentences[sentence][start:start + size]) == key:
+                    positions.append((number, sentence, start))
+        return positions
@@ -1,8 +1,13 @@
 import PyPDF2
-import docx
 import re
 from io import BytesIO
 
+from .docx_reader import docx_text
+from .extraction_cache import get_extraction_cache, read_upload_bytes
+from .resume_index import ResumeIndex
+from .skill_canon import CANON
+from .skill_matcher import SKILL_MATCHER
+
 class ResumeParser:
     def __init__(self):
         pass
@@ -10,38 +15,38 @@ class ResumeParser:
     def extract_text_from_pdf(self, pdf_file):
         try:
             # Handle different file input types
-            if hasattr(pdf_file, 'read'):
-                # If it's a file-like object
-                file_content = pdf_file.read()
-                pdf_file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                file_content = pdf_file
-                
-            pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-                else:
-                    # Handle empty page text
-                    text += "\n"
-            return text.strip()
+            file_content = read_upload_bytes(pdf_file)
+            return get_extraction_cache().get_or_extract(
+                'parser-pdf', file_content, lambda: self._extract_pdf_text(file_content)
+            )
         except Exception as e:
             print(f"Error extracting text from PDF: {e}")
             return ""
+
+    def _extract_pdf_text(self, file_content):
+        pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
+        text = ""
+        for page in pdf_reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+            else:
+                # Handle empty page text
+                text += "\n"
+        return text.strip()
             
     def extract_text_from_docx(self, docx_file):
         try:
-            doc = docx.Document(BytesIO(docx_file.read()))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            file_content = read_upload_bytes(docx_file)
+            return get_extraction_cache().get_or_extract(
+                'parser-docx', file_content, lambda: self._extract_docx_text(file_content)
+            )
         except Exception as e:
             print(f"Error extracting text from DOCX: {e}")
             return ""
+
+    def _extract_docx_text(self, file_content):
+        return docx_text(file_content).strip()
             
     def extract_text(self, file):
         # Reset file pointer to beginning
@@ -58,7 +63,6 @@ class ResumeParser:
         text = self.extract_text(file)
         
         # Simple keyword-based parsing
-        skills = []
         experience = []
         education = []
         
@@ -67,11 +71,14 @@ class ResumeParser:
                          'node', 'express', 'django', 'flask', 'spring', 'docker', 'kubernetes', 'aws', 
                          'azure', 'git', 'jenkins', 'jira']
                          
-        # Look for skills
-        text_lower = text.lower()
-        for skill in skill_keywords:
-            if skill in text_lower:
-                skills.append(skill)
+        # Look for skills by canonical ID, so "NodeJS" counts as "node" and each
+        # skill is reported once under its canonical name
+        index = ResumeIndex(text)
+        found_ids = SKILL_MATCHER.hits(index)
+        skills = CANON.canonical_skills(
+            skill for skill in skill_keywords
+            if skill in index or any(skill_id in found_ids for skill_id in CANON.canonicalize(skill))
+        )
                 
         return {
             "skills": skills,
@@ -0,0 +1,125 @@
+"""
+Single-pass section segmentation for resume text.
+
+Every line is classified once against all section headers, using the hits
+of a keyword-automaton scan cached per line, and the open/close state of
+every section is advanced on that same pass. The resulting ``SectionMap`` holds the
+entries of each section, so the analyzer's extract_* methods read from it
+instead of walking the whole text again with every keyword list.
+"""
+from functools import lru_cache
+
+from .keyword_automaton import KeywordAutomaton
+
+
+class SectionRules:
+    """Section keyword lists compiled once and shared by every segmentation.
+
+    ``section_keywords`` maps a section name to the keywords whose presence
+    in a line opens that section. A line containing any of the
+    ``boundary_keywords`` (and none of the section's own) closes the open
+    section. The keywords are registered, tagged, in ``automaton``, which
+    may be shared with other lookups over the same text.
+    """
+
+    def __init__(self, section_keywords, boundary_keywords, automaton=None):
+        self.sections = list(section_keywords)
+        self.automaton = automaton if automaton is not None else KeywordAutomaton()
+        for section, keywords in section_keywords.items():
+            for keyword in keywords:
+                self.automaton.add(keyword, ('section', section))
+        for keyword in boundary_keywords:
+            self.automaton.add(keyword, ('boundary', None))
+        # A line that is exactly a keyword is a bare header and is not kept as content
+        self.headers = {section: {keyword.lower() for keyword in keywords}
+                        for section, keywords in section_keywords.items()}
+        # Keywords never span a line break, so hits are cached per line; lines
+        # unchanged since an earlier analysis (or common to many resumes) are not rescanned
+        self.line_keywords = lru_cache(maxsize=8192)(self._scan_line)
+
+    def _scan_line(self, lower_line):
+        return frozenset(keyword for _, keyword in self.automaton.iter_matches(lower_line))
+
+    def classify(self, keywords):
+        """Sections opened by, and whether a boundary is among, a line's keywords"""
+        sections = set()
+        is_boundary = False
+        for keyword in keywords:
+            for kind, name in self.automaton.tags[keyword]:
+                if kind == 'section':
+                    sections.add(name)
+                elif kind == 'boundary':
+                    is_boundary = True
+        return sections, is_boundary
+
+    def segment(self, text):
+        """Segment a complete text in one pass"""
+        segmenter = SectionSegmenter(self)
+        for raw_line in text.split('\n'):
+            segmenter.classify(raw_line)
+        return segmenter.close()
+
+
+class SectionMap:
+    def __init__(self, sections):
+        # Section name -> list of entries, each entry its lines joined by spaces
+        self.entries = {section: [] for section in sections}
+        # First few non-empty lines, where an unlabelled summary usually sits
+        self.first_lines = []
+        # Every keyword of the rules' automaton found anywhere in the text
+        self.keywords = set()
+        self.line_count = 0
+
+
+class SectionSegmenter:
+    FIRST_LINES = 5
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.map = SectionMap(rules.sections)
+        self._open = {section: False for section in rules.sections}
+        self._current = {section: [] for section in rules.sections}
+
+    def close(self):
+        """Close open sections and return the map"""
+        for section in self.rules.sections:
+            self._flush(section)
+        return self.map
+
+    def _flush(self, section):
+        current = self._current[section]
+        if current:
+            self.map.entries[section].append(' '.join(current))
+            self._current[section] = []
+
+    def classify(self, raw_line):
+        """Advance every section's state by one line"""
+        line = raw_line.strip()
+        lower = line.lower()
+        self.map.line_count += 1
+        if line and len(self.map.first_lines) < self.FIRST_LINES:
+            self.map.first_lines.append(line)
+        keywords = self.rules.line_keywords(lower)
+        self.map.keywords.update(keywords)
+        opened, is_boundary = self.rules.classify(keywords)
+
+        for section in self.rules.sections:
+            if section in opened:
+                # Section header, possibly with content on the same line
+                if lower not in self.rules.headers[section]:
+                    self._current[section].append(line)
+                self._open[section] = True
+                continue
+            if not self._open[section]:
+                continue
+
+            if line:
+                if is_boundary:
+                    # Another section's header closes this one
+                    self._open[section] = False
+                    self._flush(section)
+                    continue
+                self._current[section].append(line)
+            else:
+                # A blank line ends the current entry
+                self._flush(section)
@@ -0,0 +1,132 @@
+"""
+Score a resume against every role in JOB_ROLES at once.
+
+The skills of all roles are compiled into a skill x role matrix: required
+skills count 1, recommended skills ``RECOMMENDED_WEIGHT``. Rows are
+canonical skill IDs (see skill_canon), so "HTML" and "HTML5" share a row
+and a composite such as "React/Angular/Vue" is met by any of its parts. A
+resume becomes a 0/1 vector of which rows its skill IDs cover, and one
+vector-matrix product gives the match for every role, so switching the
+target role needs no new analysis.
+
+The vocabulary is compiled when the module is imported; the NumPy/SciPy
+matrices are built on first use. Without NumPy the same product is done
+over the sparse columns in plain Python.
+"""
+from config.job_roles import JOB_ROLES
+
+from .skill_canon import CANON
+
+REQUIRED_WEIGHT = 1.0
+RECOMMENDED_WEIGHT = 0.5
+
+
+class RoleMatrix:
+    def __init__(self, job_roles):
+        # Column order: (category, role)
+        self.roles = []
+        # Row order: canonical ID tuples (alternatives of a composite), plus a display name for each
+        self.skills = []
+        self.skill_names = []
+        # Sparse entries as (skill row, role column, value)
+        self._required_entries = []
+        self._weighted_entries = []
+        rows = {}
+
+        def row(skill):
+            key = CANON.canonicalize(skill)
+            if key not in rows:
+                rows[key] = len(self.skills)
+                self.skills.append(key)
+                self.skill_names.append(CANON.name(key[0]) if len(key) == 1 else skill)
+            return rows[key]
+
+        for category, roles in job_roles.items():
+            for role, info in roles.items():
+                column = len(self.roles)
+                self.roles.append((category, role))
+                for skill in info.get('required_skills', []):
+                    self._required_entries.append((row(skill), column, 1.0))
+                    self._weighted_entries.append((row(skill), column, REQUIRED_WEIGHT))
+                for group in info.get('recommended_skills', {}).values():
+                    for skill in group:
+                        self._weighted_entries.append((row(skill), column, RECOMMENDED_WEIGHT))
+
+        self._matrices = None
+
+    def _build(self):
+        """Build the matrices and their column totals once; duplicate entries are summed"""
+        try:
+            import numpy as np
+        except ImportError:
+            self._matrices = 'python'
+            return self._matrices
+
+        shape = (len(self.skills), len(self.roles))
+        matrices = []
+        for entries in (self._required_entries, self._weighted_entries):
+            rows = [entry[0] for entry in entries]
+            columns = [entry[1] for entry in entries]
+            values = [entry[2] for entry in entries]
+            try:
+                from scipy import sparse
+                matrix = sparse.coo_matrix((values, (rows, columns)), shape=shape).tocsc()
+            except ImportError:
+                matrix = np.zeros(shape)
+                np.add.at(matrix, (rows, columns), values)
+            matrices.append((matrix, np.asarray(matrix.sum(axis=0)).ravel().tolist()))
+        self._matrices = matrices
+        return self._matrices
+
+    def skill_vector(self, skill_ids):
+        """1 for every skill row with an ID in ``skill_ids``, else 0"""
+        return [1.0 if any(skill_id in skill_ids for skill_id in key) else 0.0 for key in self.skills]
+
+    def _products(self, vector):
+        matrices = self._matrices or self._build()
+        if matrices == 'python':
+            products = []
+            for entries in (self._required_entries, self._weighted_entries):
+                hits = [0.0] * len(self.roles)
+                totals = [0.0] * len(self.roles)
+                for skill_row, column, value in entries:
+                    hits[column] += vector[skill_row] * value
+                    totals[column] += value
+                products.append((hits, totals))
+            return products
+
+        import numpy as np
+        x = np.asarray(vector)
+        products = []
+        for matrix, totals in matrices:
+            hits = np.asarray(matrix.T @ x).ravel()
+            products.append((hits.tolist(), totals))
+        return products
+
+    def score(self, skill_ids):
+        """Match of a resume's canonical skill IDs against every role, in JOB_ROLES order.
+
+        ``required_score`` is the percentage of required skills found, the
+        same figure ``calculate_keyword_match`` gives for the role.
+        ``fit_score`` also credits recommended skills.
+        """
+        vector = self.skill_vector(skill_ids)
+        (required_hits, required_totals), (weighted_hits, weighted_totals) = self._products(vector)
+        scores = []
+        for column, (category, role) in enumerate(self.roles):
+            scores.append({
+                'category': category,
+                'role': role,
+                'required_score': 100 * required_hits[column] / required_totals[column] if required_totals[column] else 0,
+                'fit_score': 100 * weighted_hits[column] / weighted_totals[column] if weighted_totals[column] else 0
+            })
+        return scores
+
+    def rank(self, skill_ids, top=None):
+        """Roles ordered from best to worst fit"""
+        ranked = sorted(self.score(skill_ids), key=lambda item: (item['fit_score'], item['required_score']),
+                        reverse=True)
+        return ranked[:top] if top else ranked
+
+
+ROLE_MATRIX = RoleMatrix(JOB_ROLES)
@@ -0,0 +1,110 @@
+"""
+Canonical skill IDs.
+
+Every spelling of a skill, from the SKILL_SYNONYMS table ("ReactJS",
+"K8s", "Postgres") and from JOB_ROLES, is compiled at import
+into one dictionary from compact form to canonical ID. The ID is the
+compact form of the canonical name ("nodejs" for "Node.js"), so looking a
+phrase up costs one cached normalization and one dictionary hit.
+
+Slash composites such as "React/Angular/Vue" are split into one ID per
+alternative when every part is a known skill; "CI/CD" and "UI/UX" stay
+whole because their parts are not skills on their own.
+"""
+from functools import lru_cache
+
+from config.job_roles import JOB_ROLES
+from config.skill_synonyms import SKILL_SYNONYMS
+
+from .resume_index import skill_form
+
+
+def skill_vocabulary(job_roles):
+    """Every required and recommended skill named in ``job_roles``"""
+    skills = []
+    for roles in job_roles.values():
+        for info in roles.values():
+            skills.extend(info.get('required_skills', []))
+            for group in info.get('recommended_skills', {}).values():
+                skills.extend(group)
+    return skills
+
+
+class SkillCanon:
+    def __init__(self, synonyms, vocabulary=()):
+        # Canonical ID -> display name
+        self.names = {}
+        # Every known spelling, as written -> canonical ID, e.g. for building matchers
+        self.aliases = {}
+        # Compact form of every known spelling -> canonical ID
+        self._ids = {}
+        for canonical, aliases in synonyms.items():
+            self._register(canonical, canonical)
+            for alias in aliases:
+                self._register(alias, canonical)
+
+        # Plain skills first, so composites can be split into them
+        composites = [skill for skill in vocabulary if '/' in skill]
+        for skill in vocabulary:
+            if '/' not in skill:
+                self._register(skill, skill)
+        for skill in composites:
+            if self.lookup(skill) is None and self._split(skill) is None:
+                self._register(skill, skill)
+
+        self.canonicalize = lru_cache(maxsize=4096)(self._canonicalize)
+
+    def _register(self, phrase, canonical):
+        form = skill_form(phrase)
+        if not form:
+            return
+        # The first skill to claim a compact form keeps it
+        skill_id = self._ids.setdefault(form, skill_form(canonical))
+        self.names.setdefault(skill_id, canonical)
+        self.aliases.setdefault(phrase, skill_id)
+
+    def __contains__(self, skill_id):
+        return skill_id in self.names
+
+    def lookup(self, phrase):
+        """Canonical ID of a known spelling, or None"""
+        return self._ids.get(skill_form(phrase))
+
+    def name(self, skill_id):
+        """Display name of a canonical ID; unknown IDs are returned as is"""
+        return self.names.get(skill_id, skill_id)
+
+    def _split(self, skill):
+        """IDs of a slash composite's parts, or None unless every part is known"""
+        parts = [self.lookup(part) for part in skill.split('/')]
+        if len(parts) < 2 or None in parts:
+            return None
+        return tuple(dict.fromkeys(parts))
+
+    def _canonicalize(self, skill):
+        """Canonical IDs ``skill`` stands for: one, or one per alternative of a composite.
+
+        A skill nobody listed gets its compact form as ID, so it still
+        matches its own variants consistently.
+        """
+        skill_id = self.lookup(skill)
+        if skill_id is not None:
+            return (skill_id,)
+        if '/' in skill:
+            parts = self._split(skill)
+            if parts:
+                return parts
+        form = skill_form(skill)
+        return (form,) if form else ()
+
+    def canonical_skills(self, skills):
+        """Display names of ``skills`` with duplicates merged, in first-seen order"""
+        names = {}
+        for skill in skills:
+            for skill_id in self.canonicalize(skill):
+                # Unknown skills keep the spelling they were first seen with
+                names.setdefault(skill_id, self.names.get(skill_id, skill))
+        return list(names.values())
+
+
+CANON = SkillCanon(SKILL_SYNONYMS, skill_vocabulary(JOB_ROLES))
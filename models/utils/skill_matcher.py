@@ -0,0 +1,192 @@
+"""
+Fuzzy skill matching backed by a trigram index.
+
+Skills and resume terms are compared in a compact form: their tokens run
+together without separators, so "React JS", "React.js" and "ReactJS" are
+all ``reactjs``. A term matches a skill when the compact forms are equal,
+when one extends the other by a short suffix ("Postgres" / "PostgreSQL")
+or when they are within a small edit distance ("Pyhton", "Kubernets").
+Typos keep the first letter and, below ten characters, never substitute
+one letter for another, so ordinary words one letter away from a skill
+("Nesting" / "Testing", "Resign" / "Design") are not matched.
+The vocabulary is every spelling SkillCanon knows, and matches are reported
+as canonical skill IDs.
+
+Comparing every resume term with every skill would be far too slow, so
+the vocabulary's trigrams are kept in an inverted index: a term only
+counts the skills sharing enough of its trigrams, and only those few
+candidates get an edit-distance check. Results are cached per term, and
+most terms repeat across resumes, so a resume costs about as much as the
+exact lookup.
+"""
+from functools import lru_cache
+
+from .resume_index import compact, phrase_key, skill_form
+from .skill_canon import CANON
+
+# Shortest compact form that is matched by anything but equality
+MIN_FUZZY_LENGTH = 4
+# A prefix extension must cover this share of the longer form ("unit" is not "unity",
+# and the plain words "node" and "express" are not "nodejs" and "expressjs")
+MIN_PREFIX_RATIO = 0.8
+# Resume n-grams tried against the vocabulary
+MAX_TERM_TOKENS = 2
+# Shortest form where a typo may replace a letter; shorter ones only allow
+# a missing, extra or swapped letter ("Tasting" is not "Testing")
+MIN_SUBSTITUTION_LENGTH = 10
+
+
+def allowed_edits(length):
+    """Edits tolerated between forms whose shorter one has ``length`` characters"""
+    if length >= 10:
+        return 2
+    if length >= 6:
+        return 1
+    return 0
+
+
+def trigrams(form):
+    """Distinct trigrams of ``form``, padded at the start so a prefix shares all of its own"""
+    padded = '$$' + form
+    return set(map(''.join, zip(padded, padded[1:], padded[2:])))
+
+
+def bounded_distance(a, b, limit, substitutions=True):
+    """Edit distance with adjacent transpositions, or ``limit + 1`` once it exceeds ``limit``.
+
+    Only the diagonal band of width ``limit`` is filled, so a check costs O(len * limit).
+    Without ``substitutions`` a changed letter counts as too far.
+    """
+    too_far = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return too_far
+    previous2 = None
+    previous = [j if j <= limit else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [too_far] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1 if substitutions else too_far
+            best = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                best = min(best, previous2[j - 2] + 1)
+            current[j] = best
+        if min(current[low - 1:high + 1]) > limit:
+            return too_far
+        previous2, previous = previous, current
+    return min(previous[-1], too_far)
+
+
+def is_close(term, skill):
+    """Whether compact forms ``term`` and ``skill`` name the same skill
+
+    >>> is_close('pyhton', 'python'), is_close('kubernets', 'kubernetes')
+    (True, True)
+    >>> is_close('nesting', 'testing'), is_close('tasting', 'testing'), is_close('could', 'cloud')
+    (False, False, False)
+    """
+    if term == skill:
+        return True
+    shorter, longer = (term, skill) if len(term) <= len(skill) else (skill, term)
+    if len(shorter) < MIN_FUZZY_LENGTH:
+        return False
+    if (longer.startswith(shorter) and len(longer) - len(shorter) >= 2
+            and len(shorter) >= MIN_PREFIX_RATIO * len(longer)):
+        return True
+    limit = allowed_edits(len(shorter))
+    if limit == 0 or term[0] != skill[0]:
+        return False
+    substitutions = len(shorter) >= MIN_SUBSTITUTION_LENGTH
+    return bounded_distance(term, skill, limit, substitutions) <= limit
+
+
+class FuzzySkillMatcher:
+    def __init__(self, skills):
+        """``skills`` maps each spelling to its canonical ID; a plain list of skills
+        uses their compact forms as IDs"""
+        if not isinstance(skills, dict):
+            skills = {skill: skill_form(skill) for skill in skills}
+        # Compact form -> canonical ID
+        self._ids = {}
+        # Compact form -> (length, trigram count), and trigram -> compact forms containing it
+        self._sizes = {}
+        self._postings = {}
+        # Spellings too long to be resume terms, found by exact lookup instead
+        self._long_keys = []
+        for skill, skill_id in skills.items():
+            form = skill_form(skill)
+            if not form or form in self._ids:
+                continue
+            self._ids[form] = skill_id
+            grams = trigrams(form)
+            self._sizes[form] = (len(form), len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(form)
+            if len(phrase_key(skill)) > MAX_TERM_TOKENS:
+                self._long_keys.append((phrase_key(skill), skill_id))
+        # Matches per resume term and per line; both repeat across resumes and
+        # edits, so most lookups are cache hits
+        self.lookup = lru_cache(maxsize=65536)(self._lookup)
+        self.line_hits = lru_cache(maxsize=8192)(self._line_hits)
+
+    def _lookup(self, key):
+        """Canonical IDs of the skills matching the term with token tuple ``key``"""
+        term = compact(key)
+        # A known spelling stands for its own skill only
+        if term in self._ids:
+            return frozenset([self._ids[term]])
+        if len(term) < MIN_FUZZY_LENGTH:
+            return frozenset()
+
+        grams = trigrams(term)
+        shared = {}
+        for gram in grams:
+            for form in self._postings.get(gram, ()):
+                shared[form] = shared.get(form, 0) + 1
+        matches = []
+        term_length, term_grams = len(term), len(grams)
+        for form, count in shared.items():
+            # Any match shares at least two trigrams; most candidates only share the first letter
+            if count < 2:
+                continue
+            form_length, form_grams = self._sizes[form]
+            # An extension shares every trigram of the shorter form; within k edits the
+            # lengths differ by at most k and at most 4k trigrams of the longer form are
+            # lost (three per substitution, four per swap of adjacent characters)
+            if count < min(term_grams, form_grams):
+                edits = allowed_edits(min(term_length, form_length))
+                if abs(term_length - form_length) > edits or count < max(term_grams, form_grams) - 4 * edits:
+                    continue
+            if is_close(term, form):
+                matches.append(self._ids[form])
+        return frozenset(matches)
+
+    def match(self, phrase):
+        """Canonical IDs matching a single phrase"""
+        return self.lookup(phrase_key(phrase))
+
+    def _line_hits(self, line_keys):
+        """Canonical IDs matched by the n-grams of one line"""
+        found = set()
+        for key in line_keys:
+            if len(key) <= MAX_TERM_TOKENS:
+                found.update(self.lookup(key))
+        return frozenset(found)
+
+    def hits(self, resume_index):
+        """Canonical IDs of the skills mentioned anywhere in a ResumeIndex"""
+        found = set().union(*(self.line_hits(line.keys) for line in resume_index.lines))
+        found.update(skill_id for key, skill_id in self._long_keys if key in resume_index)
+        return found
+
+
+# Every spelling SkillCanon knows, matched to canonical IDs
+SKILL_MATCHER = FuzzySkillMatcher(CANON.aliases)
+
+
+@lru_cache(maxsize=64)
+def extra_matcher(skills):
+    """Matcher for required skills SkillCanon does not know, e.g. from ``--skills``"""
+    return FuzzySkillMatcher(sorted(skills))
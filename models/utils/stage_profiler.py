@@ -0,0 +1,230 @@
+"""
+Opt-in per-stage profiling for the resume analyzer.
+
+A ``StageProfiler`` hands out one ``StageTimer`` per analysis. Each stage
+of the analysis runs inside ``timer.stage(name)``, which records its wall
+time and, when allocation tracking is on, the memory it allocated (net and
+peak, via tracemalloc). The figures are attached to the analysis result
+and passed to every configured sink:
+
+- ``LogSink``         one line per analysis, printed or sent to a logger
+- ``CsvSink``         one row per stage appended to a CSV file
+- ``PrometheusSink``  cumulative counters rewritten to a node_exporter
+                      textfile-collector file, one per process
+
+Profiling is off unless a profiler is passed to ``ResumeAnalyzer`` or
+``RESUME_PROFILE_SINKS`` is set (see ``profiler_from_env``).
+"""
+import contextlib
+import csv
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+
+class StageTimer:
+    def __init__(self, track_allocations=False):
+        self.track_allocations = track_allocations
+        # Stage name -> {'seconds', and with allocation tracking 'allocated_bytes', 'peak_bytes'}
+        self.timings = {}
+        self._started_tracing = False
+        self._start = time.perf_counter()
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage ``name``"""
+        if self.track_allocations:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing = {'seconds': time.perf_counter() - start}
+            if self.track_allocations:
+                current, peak = tracemalloc.get_traced_memory()
+                timing['allocated_bytes'] = current - before
+                timing['peak_bytes'] = max(0, peak - before)
+            self.timings[name] = timing
+
+    def finish(self):
+        """Stop timing and return the stage timings plus a 'total' entry"""
+        self.timings['total'] = {'seconds': time.perf_counter() - self._start}
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return self.timings
+
+
+class _NullTimer:
+    """Stands in for a StageTimer when profiling is off"""
+
+    def stage(self, name):
+        return contextlib.nullcontext()
+
+
+NULL_TIMER = _NullTimer()
+
+
+class StageProfiler:
+    def __init__(self, sinks=None, track_allocations=False):
+        self.sinks = list(sinks or [])
+        self.track_allocations = track_allocations
+
+    def start(self):
+        return StageTimer(self.track_allocations)
+
+    def emit(self, timings, labels=None):
+        """Send one analysis' timings to every sink; a failing sink never breaks analysis"""
+        for sink in self.sinks:
+            try:
+                sink.write(timings, labels or {})
+            except Exception as e:
+                print(f"Profiling sink {type(sink).__name__} failed: {e}")
+
+
+class LogSink:
+    def __init__(self, logger=None):
+        self.logger = logger
+
+    def write(self, timings, labels):
+        stages = ", ".join(
+            f"{name}={timing['seconds'] * 1000:.2f}ms"
+            + (f"/{timing['allocated_bytes'] / 1024:.0f}KiB" if 'allocated_bytes' in timing else "")
+            for name, timing in timings.items()
+        )
+        message = f"analyze_resume timings: {stages}"
+        if self.logger is not None:
+            self.logger.info(message)
+        else:
+            print(message)
+
+
+class CsvSink:
+    FIELDS = ['timestamp', 'stage', 'seconds', 'allocated_bytes', 'peak_bytes', 'labels']
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, timings, labels):
+        timestamp = datetime.now().isoformat(timespec='milliseconds')
+        label_text = ";".join(f"{key}={value}" for key, value in sorted(labels.items()))
+        with self._lock:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, 'a', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                if new_file:
+                    writer.writeheader()
+                for name, timing in timings.items():
+                    writer.writerow({
+                        'timestamp': timestamp,
+                        'stage': name,
+                        'seconds': f"{timing['seconds']:.6f}",
+                        'allocated_bytes': timing.get('allocated_bytes', ''),
+                        'peak_bytes': timing.get('peak_bytes', ''),
+                        'labels': label_text
+                    })
+
+
+class PrometheusSink:
+    """Cumulative per-stage counters in the Prometheus text exposition format.
+
+    Each process writes its own file, ``path`` with the process id before
+    the extension (``analyzer.prom`` -> ``analyzer.1234.prom``), and labels
+    its series with ``pid``, so processes never overwrite each other.
+    """
+
+    def __init__(self, path, prefix="resume_analyzer"):
+        self.path = path
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._seconds = {}
+        self._calls = {}
+        self._allocated = {}
+
+    def write(self, timings, labels):
+        with self._lock:
+            for name, timing in timings.items():
+                self._seconds[name] = self._seconds.get(name, 0.0) + timing['seconds']
+                self._calls[name] = self._calls.get(name, 0) + 1
+                if 'allocated_bytes' in timing:
+                    self._allocated[name] = self._allocated.get(name, 0) + max(0, timing['allocated_bytes'])
+            self._flush()
+
+    def process_path(self):
+        """File this process writes"""
+        root, extension = os.path.splitext(self.path)
+        return f"{root}.{os.getpid()}{extension}"
+
+    def _flush(self):
+        pid = os.getpid()
+        lines = [
+            f"# HELP {self.prefix}_stage_seconds_total Wall time spent in each analysis stage",
+            f"# TYPE {self.prefix}_stage_seconds_total counter"
+        ]
+        lines += [f'{self.prefix}_stage_seconds_total{{stage="{name}",pid="{pid}"}} {value:.6f}'
+                  for name, value in sorted(self._seconds.items())]
+        lines += [
+            f"# HELP {self.prefix}_stage_calls_total Number of times each analysis stage ran",
+            f"# TYPE {self.prefix}_stage_calls_total counter"
+        ]
+        lines += [f'{self.prefix}_stage_calls_total{{stage="{name}",pid="{pid}"}} {value}'
+                  for name, value in sorted(self._calls.items())]
+        if self._allocated:
+            lines += [
+                f"# HELP {self.prefix}_stage_allocated_bytes_total Memory allocated by each analysis stage",
+                f"# TYPE {self.prefix}_stage_allocated_bytes_total counter"
+            ]
+            lines += [f'{self.prefix}_stage_allocated_bytes_total{{stage="{name}",pid="{pid}"}} {value}'
+                      for name, value in sorted(self._allocated.items())]
+
+        # Write then rename so the collector never reads a half-written file
+        path = self.process_path()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+
+
+_profilers = {}
+_profilers_lock = threading.Lock()
+
+
+def profiler_from_env():
+    """Profiler configured by RESUME_PROFILE_SINKS, or None when it is unset.
+
+    The variable is a comma-separated list of ``log``, ``csv=<path>`` and
+    ``prometheus=<path>``. Allocation tracking (slower) is turned on with
+    RESUME_PROFILE_ALLOCATIONS=1. The profiler and its sinks are shared by
+    the whole process, so cumulative counters survive Streamlit reruns.
+    """
+    spec = os.getenv("RESUME_PROFILE_SINKS", "").strip()
+    if not spec:
+        return None
+    track_allocations = os.getenv("RESUME_PROFILE_ALLOCATIONS") == "1"
+    with _profilers_lock:
+        profiler = _profilers.get((spec, track_allocations))
+        if profiler is None:
+            profiler = _profilers[(spec, track_allocations)] = _build_profiler(spec, track_allocations)
+        return profiler
+
+
+def _build_profiler(spec, track_allocations):
+    sinks = []
+    for item in spec.split(','):
+        kind, _, path = item.strip().partition('=')
+        if kind == 'log':
+            sinks.append(LogSink())
+        elif kind == 'csv' and path:
+            sinks.append(CsvSink(path))
+        elif kind == 'prometheus' and path:
+            sinks.append(PrometheusSink(path))
+        else:
+            print(f"Ignoring unknown profiling sink: {item}")
+    return StageProfiler(sinks, track_allocations=track_allocations)
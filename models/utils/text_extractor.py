@@ -0,0 +1,459 @@
+"""
+Single extraction pipeline for uploaded resumes.
+
+An ``ExtractionPipeline`` owns one upload for its whole lifecycle: it reads
+the bytes once, runs the backend chain once and hands the same
+``ExtractionResult`` (text, per-page metadata and the backend that produced
+it) to every analyzer that asks for it.
+"""
+import io
+import os
+import time
+import warnings
+
+from .docx_reader import docx_text
+from .extraction_cache import get_extraction_cache, hash_bytes, read_upload_bytes
+from .extraction_worker import iter_isolated_pages
+from .ocr import iter_ocr_pages, pdf_page_count
+from .pdf_probe import probe_pdf
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Pages with fewer embedded characters than this are treated as scanned
+MIN_PAGE_CHARS = int(os.getenv("RESUME_MIN_PAGE_CHARS", "25"))
+
+# Places we look for the Poppler binaries pdf2image needs on Windows
+POPPLER_PATHS = [
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'poppler', 'poppler-24.08.0', 'Library', 'bin'),
+    r'C:\poppler\Library\bin',
+    r'C:\Program Files\poppler\bin',
+    r'C:\Program Files (x86)\poppler\bin',
+    r'C:\poppler\bin'
+]
+
+
+def find_poppler_path():
+    """Return the Poppler bin directory on Windows, or None to use PATH"""
+    if os.name != 'nt':
+        return None
+    for path in POPPLER_PATHS:
+        if os.path.exists(path):
+            return path
+    return r'C:\poppler\Library\bin'
+
+
+def detect_file_type(uploaded_file, file_type=None):
+    """Work out the MIME type of an upload from its metadata or name"""
+    if file_type:
+        return file_type
+    if getattr(uploaded_file, 'type', None):
+        return uploaded_file.type
+    name = getattr(uploaded_file, 'name', '') or ''
+    if name.lower().endswith('.pdf'):
+        return PDF_MIME
+    if name.lower().endswith('.docx'):
+        return DOCX_MIME
+    return "text/plain"
+
+
+class ExtractionResult:
+    def __init__(self, text="", pages=None, backend=None, file_hash=None, file_type=None,
+                 status="ok", errors=None, elapsed=0.0, probe=None):
+        self.text = text
+        self.pages = pages or []
+        self.backend = backend
+        self.file_hash = file_hash
+        self.file_type = file_type
+        self.status = status
+        self.errors = errors or []
+        self.elapsed = elapsed
+        self.probe = probe
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    @property
+    def ok(self):
+        return bool(self.text.strip())
+
+    def to_dict(self):
+        return {
+            'text': self.text,
+            'pages': self.pages,
+            'backend': self.backend,
+            'page_count': self.page_count,
+            'file_hash': self.file_hash,
+            'file_type': self.file_type,
+            'status': self.status,
+            'errors': self.errors,
+            'elapsed': self.elapsed,
+            'probe': self.probe
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            text=data.get('text', ''),
+            pages=data.get('pages', []),
+            backend=data.get('backend'),
+            file_hash=data.get('file_hash'),
+            file_type=data.get('file_type'),
+            status=data.get('status', 'ok'),
+            errors=data.get('errors', []),
+            elapsed=data.get('elapsed', 0.0),
+            probe=data.get('probe')
+        )
+
+
+def _page_record(number, text, backend):
+    return {'page': number, 'text': text, 'backend': backend, 'chars': len(text)}
+
+
+def has_text_layer(page_text):
+    """Whether a page's embedded text is substantial enough to skip OCR"""
+    return len(page_text.strip()) >= MIN_PAGE_CHARS
+
+
+def _pdfplumber_page_text(page):
+    # Suppress specific warnings about PDFColorSpace conversion
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
+        warnings.filterwarnings("ignore", message=".*Cannot convert.*")
+        return page.extract_text() or ""
+
+
+def _iter_pdfplumber(file_content, state, first_page=1, skip=(), last_page=None):
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+        page_count = min(len(pdf.pages), last_page or len(pdf.pages))
+        state['total'] = page_count
+        for index in range(first_page - 1, page_count):
+            if index + 1 in skip:
+                yield index + 1, ""
+                continue
+            yield index + 1, _pdfplumber_page_text(pdf.pages[index])
+
+
+def _iter_pypdf2(file_content, state, first_page=1, skip=(), last_page=None):
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    page_count = min(len(pdf_reader.pages), last_page or len(pdf_reader.pages))
+    state['total'] = page_count
+    for index in range(first_page - 1, page_count):
+        if index + 1 in skip:
+            yield index + 1, ""
+            continue
+        yield index + 1, pdf_reader.pages[index].extract_text() or ""
+
+
+TEXT_READERS = {
+    'pdfplumber': _iter_pdfplumber,
+    'pypdf2': _iter_pypdf2
+}
+
+
+class SinglePageReader:
+    """Reads single pages with another backend.
+
+    The document is opened on the first request and kept open, so a PDF
+    with many weak pages is parsed once, not once per page; ``close`` it
+    when done.
+    """
+
+    def __init__(self, file_content, backend):
+        self.file_content = file_content
+        self.backend = backend
+        self._pdf = None
+        self._pages = None
+
+    def _open(self):
+        if self.backend == 'pdfplumber':
+            import pdfplumber
+            self._pdf = pdfplumber.open(io.BytesIO(self.file_content))
+            self._pages = self._pdf.pages
+        else:
+            import PyPDF2
+            self._pages = PyPDF2.PdfReader(io.BytesIO(self.file_content)).pages
+
+    def read(self, page_number):
+        """Text of one page, or "" if the backend can't read it"""
+        try:
+            if self._pages is None:
+                self._open()
+            if not 0 < page_number <= len(self._pages):
+                return ""
+            page = self._pages[page_number - 1]
+            if self.backend == 'pdfplumber':
+                return _pdfplumber_page_text(page)
+            return page.extract_text() or ""
+        except Exception:
+            # Don't try to open a document this backend already failed on again
+            self._pages = self._pages if self._pages is not None else []
+            return ""
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+
+def probe_plan(file_content):
+    """Run the structural probe, or return None if the PDF can't be probed"""
+    try:
+        return probe_pdf(file_content)
+    except Exception as e:
+        print(f"PDF probe failed: {e}")
+        return None
+
+
+def iter_pdf_pages(file_content, errors=None, progress=None, plan=None, max_pages=None, ocr=True):
+    """Yield ``(page_number, text, backend)`` for each PDF page as it finishes.
+
+    ``plan`` is the result of ``probe_pdf``: it picks the text reader and
+    lists the image-only pages, which skip the text readers entirely. Pages
+    with a text layer come out as soon as the text reader has them (the
+    other reader gets a second look at pages that come back empty);
+    image-only pages are collected and sent through OCR afterwards, so they
+    arrive last. Every page is yielded exactly once. Backend failures are
+    appended to ``errors`` and ``progress(done, total)`` is called after
+    each page. ``max_pages`` stops after that many pages and ``ocr=False``
+    skips the OCR stage, yielding whatever text image-only pages had.
+    """
+    errors = [] if errors is None else errors
+    plan = plan or {}
+    state = {'total': min(plan.get('page_count', 0), max_pages or plan.get('page_count', 0)), 'done': 0}
+    scanned = []
+    last_page = 0
+
+    primary = plan.get('text_reader', 'pdfplumber')
+    secondary = 'pypdf2' if primary == 'pdfplumber' else 'pdfplumber'
+    second_opinion = SinglePageReader(file_content, secondary)
+    image_pages = {page_number for page_number in plan.get('image_pages', [])
+                   if not max_pages or page_number <= max_pages}
+
+    def finished(page_number, page_text, backend):
+        state['done'] += 1
+        if progress:
+            progress(state['done'], state['total'])
+        return page_number, page_text, backend
+
+    def read_text_layer(pages, backend):
+        nonlocal last_page
+        for page_number, page_text in pages:
+            last_page = page_number
+            if page_number in image_pages:
+                scanned.append((page_number, "", None))
+                continue
+            if has_text_layer(page_text):
+                yield finished(page_number, page_text, backend)
+                continue
+            if backend == primary:
+                alternative = second_opinion.read(page_number)
+                if has_text_layer(alternative):
+                    yield finished(page_number, alternative, secondary)
+                    continue
+            # Keep whatever little text there was in case OCR finds nothing
+            scanned.append((page_number, page_text, backend))
+
+    if plan.get('backend') == 'ocr':
+        # The probe found nothing a text reader could use
+        page_numbers = list(range(1, state['total'] + 1)) or None
+    else:
+        try:
+            yield from read_text_layer(
+                TEXT_READERS[primary](file_content, state, skip=image_pages, last_page=max_pages), primary
+            )
+        except Exception as e:
+            errors.append(f"{primary}: {str(e)}")
+            print(f"{primary} extraction failed: {e}")
+            # Carry on from the page the first reader stopped at
+            try:
+                yield from read_text_layer(
+                    TEXT_READERS[secondary](file_content, state, last_page + 1, image_pages, max_pages),
+                    secondary
+                )
+            except Exception as e:
+                errors.append(f"{secondary}: {str(e)}")
+                print(f"{secondary} extraction failed: {e}")
+        finally:
+            second_opinion.close()
+
+        if last_page == 0:
+            # Neither reader could open the document, so OCR every page
+            page_numbers = None
+        elif scanned:
+            page_numbers = [page_number for page_number, _, _ in scanned]
+        else:
+            return
+
+    leftovers = {page_number: (page_text, backend) for page_number, page_text, backend in scanned}
+    if not ocr:
+        page_numbers = []
+    try:
+        if page_numbers is None and max_pages:
+            page_count = pdf_page_count(file_content, find_poppler_path())
+            page_numbers = list(range(1, min(page_count, max_pages) + 1))
+        for page_number, page_text in iter_ocr_pages(file_content, page_numbers=page_numbers,
+                                                     poppler_path=find_poppler_path()):
+            weak_text, weak_backend = leftovers.pop(page_number, ("", None))
+            if page_text.strip() or weak_backend is None:
+                yield finished(page_number, page_text, 'ocr')
+            else:
+                yield finished(page_number, weak_text, weak_backend)
+    except Exception as e:
+        errors.append(f"ocr: {str(e)}")
+        print(f"OCR extraction failed: {e}")
+
+    for page_number, (page_text, backend) in sorted(leftovers.items()):
+        yield finished(page_number, page_text, backend)
+
+
+def iter_upload_pages(file_content, file_type, errors=None, progress=None, plan=None, max_pages=None,
+                      ocr=True):
+    """Yield ``(page_number, text, backend)`` for an upload of any supported type"""
+    if file_type == PDF_MIME:
+        return iter_pdf_pages(file_content, errors, progress, plan, max_pages, ocr)
+    if file_type == DOCX_MIME:
+        return _iter_docx_pages(file_content, errors, progress)
+    return _iter_plain_pages(file_content, errors, progress)
+
+
+def extract_pdf_pages(file_content, plan=None):
+    """Extract a PDF page by page, sending only image-only pages to OCR.
+
+    Returns ``(pages, errors)`` where ``pages`` is a list of page records in
+    page order, each tagged with the backend that produced its text. The PDF
+    is probed first unless a ``plan`` is passed in.
+    """
+    errors = []
+    if plan is None:
+        plan = probe_plan(file_content)
+    pages = [_page_record(page_number, page_text, backend)
+             for page_number, page_text, backend in iter_pdf_pages(file_content, errors, plan=plan)]
+    pages.sort(key=lambda page: page['page'])
+    return pages, errors
+
+
+def _iter_docx_pages(file_content, errors=None, progress=None):
+    text = docx_text(file_content)
+    if progress:
+        progress(1, 1)
+    yield 1, text, 'docx-xml'
+
+
+def _iter_plain_pages(file_content, errors=None, progress=None):
+    if progress:
+        progress(1, 1)
+    yield 1, file_content.decode('utf-8', errors='ignore'), 'plain'
+
+
+def join_pages(pages):
+    """Join page records into a single document string"""
+    return "".join(page['text'] + "\n" for page in pages if page['text']).strip()
+
+
+def pages_backend(pages):
+    """Name of the backend behind a set of pages, or 'hybrid' if they differ"""
+    backends = {page['backend'] for page in pages if page['text'].strip()}
+    if not backends:
+        return None
+    return backends.pop() if len(backends) == 1 else 'hybrid'
+
+
+class ExtractionPipeline:
+    def __init__(self, uploaded_file, file_type=None, use_cache=True, budget=None):
+        self.data = read_upload_bytes(uploaded_file)
+        self.file_hash = hash_bytes(self.data)
+        self.file_type = detect_file_type(uploaded_file, file_type)
+        self.filename = getattr(uploaded_file, 'name', None)
+        self.use_cache = use_cache
+        # With a budget the extraction runs in an isolated worker process
+        self.budget = budget
+        self._result = None
+
+    def owns(self, uploaded_file):
+        """Whether this pipeline was built for the same bytes as ``uploaded_file``"""
+        return hash_bytes(read_upload_bytes(uploaded_file)) == self.file_hash
+
+    @property
+    def result(self):
+        """The extraction result, computed on first access"""
+        if self._result is None:
+            self._result = self.run()
+        return self._result
+
+    @property
+    def text(self):
+        return self.result.text
+
+    def run(self):
+        """Extract the whole upload and return the joined result"""
+        for _ in self.iter_pages():
+            pass
+        return self._result
+
+    def iter_pages(self, progress=None):
+        """Yield ``(page_number, text, backend)`` as each page is extracted.
+
+        ``progress(done, total)`` is called after every page. Once the last
+        page is out the joined ``ExtractionResult`` is stored on the pipeline
+        and in the shared cache, so later calls replay it without extracting.
+        """
+        if self._result is None and self.use_cache:
+            cached = get_extraction_cache().get('pipeline', self.file_hash)
+            # Older versions also stored truncated results; those are extracted again
+            if cached is not None and cached.get('status', 'ok') == "ok":
+                self._result = ExtractionResult.from_dict(cached)
+
+        if self._result is not None:
+            total = self._result.page_count
+            for done, page in enumerate(self._result.pages, 1):
+                if progress:
+                    progress(done, total)
+                yield page['page'], page['text'], page['backend']
+            return
+
+        start = time.perf_counter()
+        pages = []
+        errors = []
+        info = {'status': 'ok', 'probe': None}
+        if self.budget is not None:
+            page_iter = iter_isolated_pages(self.data, self.file_type, self.budget, errors, progress, info)
+        else:
+            if self.file_type == PDF_MIME:
+                # Decide the backend from the PDF structure before extracting anything
+                info['probe'] = probe_plan(self.data)
+            page_iter = iter_upload_pages(self.data, self.file_type, errors, progress, info['probe'])
+
+        try:
+            for page_number, page_text, backend in page_iter:
+                pages.append(_page_record(page_number, page_text, backend))
+                yield page_number, page_text, backend
+        except Exception as e:
+            errors.append(str(e))
+            print(f"Extraction failed: {e}")
+
+        pages.sort(key=lambda page: page['page'])
+        text = join_pages(pages)
+        status = info['status'] if text else "failed"
+        self._result = ExtractionResult(
+            text=text, pages=pages, backend=pages_backend(pages), file_hash=self.file_hash,
+            file_type=self.file_type, status=status, errors=errors,
+            elapsed=time.perf_counter() - start, probe=info['probe']
+        )
+        # Truncated and timed-out results depend on the budget, so only complete ones are cached
+        if self.use_cache and status == "ok":
+            get_extraction_cache().set('pipeline', self.file_hash, self._result.to_dict())
+
+
+def extract_text(uploaded_file, progress=None):
+    """Convenience wrapper returning just the joined text of an upload"""
+    pipeline = ExtractionPipeline(uploaded_file)
+    for _ in pipeline.iter_pages(progress):
+        pass
+    return pipeline.text